@@ -119,6 +119,7 @@ INSERT OR IGNORE INTO voices (voice_id, voice_name, description, watson_voice_id
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_audio_history_user_id ON audio_history(user_id);
 CREATE INDEX IF NOT EXISTS idx_audio_history_created_at ON audio_history(created_at);
+CREATE INDEX IF NOT EXISTS idx_audio_history_user_created ON audio_history(user_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_user_skills_user_id ON user_skills(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_interests_user_id ON user_interests(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_achievements_user_id ON user_achievements(user_id);
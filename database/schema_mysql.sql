@@ -28,6 +28,7 @@ CREATE TABLE IF NOT EXISTS user_skills (
     user_id INT NOT NULL,
     skill_name VARCHAR(100) NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_user_skills_user_skill (user_id, skill_name),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
@@ -37,6 +38,7 @@ CREATE TABLE IF NOT EXISTS user_interests (
     user_id INT NOT NULL,
     interest_name VARCHAR(100) NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_user_interests_user_interest (user_id, interest_name),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
@@ -1,5 +1,18 @@
-import pymysql
+try:
+    # mysqlclient (libmysqlclient C extension) exposes a pymysql-compatible API
+    import MySQLdb as pymysql
+    import MySQLdb.cursors
+except ImportError:
+    import pymysql
+from dbutils.pooled_db import PooledDB
+from cachetools import TTLCache
 import os
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import Future
+from itertools import islice
 from datetime import datetime
 import logging
 from dotenv import load_dotenv
@@ -10,6 +23,21 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Secondary indexes the schema file leaves to the application: (table, index name, columns)
+INDEXES = [
+    ('users', 'idx_users_created_at', 'created_at'),
+    ('study_materials', 'idx_sm_user_updated', 'user_id, updated_at'),
+]
+
+# Unique keys that let add_* methods dedupe server-side; added to existing tables when possible
+UNIQUE_INDEXES = [
+    ('user_skills', 'uq_user_skills_user_skill', 'user_id, skill_name'),
+    ('user_interests', 'uq_user_interests_user_interest', 'user_id, interest_name'),
+]
+
+# Rows per executemany batch when seeding child tables
+BULK_BATCH_SIZE = 50
+
 class DatabaseManager:
     def __init__(self):
         """Initialize database manager with MySQL database"""
@@ -22,10 +50,72 @@ class DatabaseManager:
             'charset': 'utf8mb4',
             'cursorclass': pymysql.cursors.DictCursor
         }
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # monotonic time of the last round-trip known to have succeeded
+        self._last_connection_ok = 0
+        # Tones and voices are small and near-static; served from memory, refreshed periodically
+        self._reference_cache = TTLCache(maxsize=2, ttl=int(os.getenv('DB_METADATA_CACHE_TTL', 300)))
+        self._cache_lock = threading.Lock()
+        # In-flight admin logins keyed by hashed (email, password) for single-flight
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        # bcrypt work factor for admin hashes; existing admin hashes are migrated on login
+        self._bcrypt_cost = int(os.getenv('BCRYPT_COST', '12'))
+        self._dummy_hash = None
+    
+    def _get_pool(self):
+        """Create the connection pool on first use"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = PooledDB(
+                        creator=pymysql,
+                        mincached=int(os.getenv('DB_POOL_MIN', 2)),
+                        maxcached=int(os.getenv('DB_POOL_MAX_IDLE', 10)),
+                        maxconnections=int(os.getenv('DB_POOL_SIZE', 20)),
+                        blocking=True,
+                        ping=1,
+                        **self.db_config
+                    )
+        return self._pool
     
     def get_connection(self):
-        """Get database connection"""
-        return pymysql.connect(**self.db_config)
+        """Get a pooled database connection; closing it returns it to the pool"""
+        return self._get_pool().connection()
+    
+    def close_pool(self):
+        """Close all pooled connections"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
+    @contextmanager
+    def seed_session(self):
+        """Yield a cursor on one connection and commit every write made through it once, on exit"""
+        # autocommit is off by default, so everything up to commit() is one transaction
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    # Write helpers re-raise errors on a caller's cursor so seed_session rolls back the whole
+    # transaction; only the standalone path logs and returns a fallback value
+    @contextmanager
+    def _write_cursor(self, cursor=None):
+        """Yield the caller's seed_session cursor, or a fresh one committed on exit"""
+        if cursor is not None:
+            yield cursor
+        else:
+            with self.seed_session() as cursor:
+                yield cursor
     
     def ensure_database_exists(self):
         """Create database and tables if they don't exist"""
@@ -57,10 +147,42 @@ class DatabaseManager:
                 else:
                     logger.warning(f"Schema file not found at {schema_path}")
                     self._create_basic_tables(conn)
+
+                self._ensure_indexes(conn)
+            
+            self._last_connection_ok = time.monotonic()
                 
         except Exception as e:
             logger.error(f"Error ensuring database exists: {e}")
             raise
+
+    def _ensure_indexes(self, conn):
+        """Create secondary indexes that are missing on existing tables"""
+        with conn.cursor() as cursor:
+            cursor.execute('''
+                SELECT TABLE_NAME AS table_name FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = DATABASE()
+            ''')
+            tables = {row['table_name'] for row in cursor.fetchall()}
+
+            cursor.execute('''
+                SELECT DISTINCT TABLE_NAME AS table_name, INDEX_NAME AS index_name
+                FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE()
+            ''')
+            existing = {(row['table_name'], row['index_name']) for row in cursor.fetchall()}
+
+            wanted = [(t, i, c, '') for t, i, c in INDEXES] + [(t, i, c, 'UNIQUE ') for t, i, c in UNIQUE_INDEXES]
+            for table, index_name, columns, kind in wanted:
+                if table not in tables or (table, index_name) in existing:
+                    continue
+                try:
+                    # A unique key fails here if duplicate rows already exist; they must be cleaned up first
+                    cursor.execute(f'CREATE {kind}INDEX {index_name} ON {table} ({columns})')
+                    logger.info(f"Created index {index_name} on {table}")
+                except Exception as e:
+                    logger.warning(f"Could not create index {index_name} on {table}: {e}")
+            conn.commit()
     
     def _create_basic_tables(self, conn):
         """Create basic tables if schema file is not found"""
@@ -125,25 +247,23 @@ class DatabaseManager:
             conn.commit()
 
     # User Management Methods
-    def create_user(self, name, email, **kwargs):
+    def create_user(self, name, email, cursor=None, **kwargs):
         """Create a new user"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    # Build dynamic insert statement
-                    fields = ['name', 'email'] + list(kwargs.keys())
-                    values = [name, email] + list(kwargs.values())
-                    placeholders = ', '.join(['%s'] * len(values))
-                    field_names = ', '.join(fields)
-                    
-                    query = f'''
-                        INSERT INTO users ({field_names})
-                        VALUES ({placeholders})
-                    '''
-                    
-                    cursor.execute(query, values)
-                    conn.commit()
-                    return cursor.lastrowid
+            with self._write_cursor(cursor) as cursor:
+                # Build dynamic insert statement
+                fields = ['name', 'email'] + list(kwargs.keys())
+                values = [name, email] + list(kwargs.values())
+                placeholders = ', '.join(['%s'] * len(values))
+                field_names = ', '.join(fields)
+                
+                query = f'''
+                    INSERT INTO users ({field_names})
+                    VALUES ({placeholders})
+                '''
+                
+                cursor.execute(query, values)
+                return cursor.lastrowid
         except Exception as e:
             logger.error(f"Error creating user: {e}")
             raise
@@ -219,6 +339,11 @@ class DatabaseManager:
         salt = bcrypt.gensalt()
         return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
+    def _hash_admin_password(self, password):
+        """Hash an admin password at the BCRYPT_COST work factor"""
+        salt = bcrypt.gensalt(self._bcrypt_cost)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
     def verify_password(self, password, hashed_password):
         """Verify a password against its hash"""
         return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
@@ -296,6 +421,17 @@ class DatabaseManager:
             logger.error(f"Error updating last login: {e}")
             return False
 
+    def _executemany_batched(self, query, rows, cursor=None):
+        """Run an INSERT for many rows in batches of BULK_BATCH_SIZE on one connection, committing once"""
+        count = 0
+        rows = iter(rows)
+        with self._write_cursor(cursor) as cursor:
+            # executemany folds each batch into a single multi-row INSERT
+            while batch := list(islice(rows, BULK_BATCH_SIZE)):
+                cursor.executemany(query, batch)
+                count += cursor.rowcount
+        return count
+
     # User Skills Methods
     def add_user_skill(self, user_id, skill_name):
         """Add a skill to user profile"""
@@ -305,6 +441,7 @@ class DatabaseManager:
                     cursor.execute('''
                         INSERT INTO user_skills (user_id, skill_name)
                         VALUES (%s, %s)
+                        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
                     ''', (user_id, skill_name))
                     conn.commit()
                     return cursor.lastrowid
@@ -312,6 +449,20 @@ class DatabaseManager:
             logger.error(f"Error adding user skill: {e}")
             return None
 
+    def add_user_skills_bulk(self, user_id, skill_names, cursor=None):
+        """Add several skills to user profile in one transaction"""
+        try:
+            return self._executemany_batched('''
+                INSERT INTO user_skills (user_id, skill_name)
+                VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE id = id
+            ''', ((user_id, skill_name) for skill_name in skill_names), cursor)
+        except Exception as e:
+            logger.error(f"Error adding user skills: {e}")
+            if cursor is not None:
+                raise
+            return 0
+
     def get_user_skills(self, user_id):
         """Get all skills for a user"""
         try:
@@ -351,6 +502,7 @@ class DatabaseManager:
                     cursor.execute('''
                         INSERT INTO user_interests (user_id, interest_name)
                         VALUES (%s, %s)
+                        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
                     ''', (user_id, interest_name))
                     conn.commit()
                     return cursor.lastrowid
@@ -358,6 +510,20 @@ class DatabaseManager:
             logger.error(f"Error adding user interest: {e}")
             return None
 
+    def add_user_interests_bulk(self, user_id, interest_names, cursor=None):
+        """Add several interests to user profile in one transaction"""
+        try:
+            return self._executemany_batched('''
+                INSERT INTO user_interests (user_id, interest_name)
+                VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE id = id
+            ''', ((user_id, interest_name) for interest_name in interest_names), cursor)
+        except Exception as e:
+            logger.error(f"Error adding user interests: {e}")
+            if cursor is not None:
+                raise
+            return 0
+
     def get_user_interests(self, user_id):
         """Get all interests for a user"""
         try:
@@ -404,6 +570,19 @@ class DatabaseManager:
             logger.error(f"Error adding user achievement: {e}")
             return None
 
+    def add_user_achievements_bulk(self, user_id, achievements, cursor=None):
+        """Add several achievements in one transaction; items are (achievement_text, achievement_date)"""
+        try:
+            return self._executemany_batched('''
+                INSERT INTO user_achievements (user_id, achievement_text, achievement_date)
+                VALUES (%s, %s, %s)
+            ''', ((user_id, text, date) for text, date in achievements), cursor)
+        except Exception as e:
+            logger.error(f"Error adding user achievements: {e}")
+            if cursor is not None:
+                raise
+            return 0
+
     def get_user_achievements(self, user_id):
         """Get all achievements for a user"""
         try:
@@ -450,6 +629,20 @@ class DatabaseManager:
             logger.error(f"Error adding user project: {e}")
             return None
 
+    def add_user_projects_bulk(self, user_id, projects, cursor=None):
+        """Add several projects in one transaction; items are dicts with add_user_project's keyword arguments"""
+        try:
+            return self._executemany_batched('''
+                INSERT INTO user_projects (user_id, project_name, description, technologies, project_url)
+                VALUES (%s, %s, %s, %s, %s)
+            ''', ((user_id, project['project_name'], project.get('description'),
+                   project.get('technologies'), project.get('project_url')) for project in projects), cursor)
+        except Exception as e:
+            logger.error(f"Error adding user projects: {e}")
+            if cursor is not None:
+                raise
+            return 0
+
     def get_user_projects(self, user_id):
         """Get all projects for a user"""
         try:
@@ -481,22 +674,35 @@ class DatabaseManager:
             return False
 
     # Audio History Methods
-    def save_audio_history(self, user_id, original_text, rewritten_text, tone, voice, audio_file_path=None):
+    def save_audio_history(self, user_id, original_text, rewritten_text, tone, voice, audio_file_path=None, cursor=None):
         """Save audio generation history"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute('''
-                        INSERT INTO audio_history 
-                        (user_id, original_text, rewritten_text, tone, voice, audio_file_path, audio_generated)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ''', (user_id, original_text, rewritten_text, tone, voice, audio_file_path, audio_file_path is not None))
-                    conn.commit()
-                    return cursor.lastrowid
+            with self._write_cursor(cursor) as cur:
+                cur.execute('''
+                    INSERT INTO audio_history 
+                    (user_id, original_text, rewritten_text, tone, voice, audio_file_path, audio_generated)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ''', (user_id, original_text, rewritten_text, tone, voice, audio_file_path, audio_file_path is not None))
+                return cur.lastrowid
         except Exception as e:
             logger.error(f"Error saving audio history: {e}")
+            if cursor is not None:
+                raise
             return None
 
+    def bulk_create_audio_history(self, rows, cursor=None):
+        """Save many history entries in one transaction; rows are (user_id, original_text, rewritten_text, tone, voice, audio_generated)"""
+        try:
+            return self._executemany_batched('''
+                INSERT INTO audio_history (user_id, original_text, rewritten_text, tone, voice, audio_generated)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            ''', rows, cursor)
+        except Exception as e:
+            logger.error(f"Error saving audio history entries: {e}")
+            if cursor is not None:
+                raise
+            return 0
+
     def get_user_audio_history(self, user_id, limit=50):
         """Get audio history for a user"""
         try:
@@ -527,27 +733,27 @@ class DatabaseManager:
             logger.error(f"Error getting audio history by ID: {e}")
             return None
 
-    def update_audio_history_status(self, history_id, status, audio_file_path=None):
+    def update_audio_history_status(self, history_id, status, audio_file_path=None, cursor=None):
         """Update audio history processing status"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    if audio_file_path:
-                        cursor.execute('''
-                            UPDATE audio_history 
-                            SET processing_status = %s, audio_file_path = %s, audio_generated = TRUE, updated_at = CURRENT_TIMESTAMP
-                            WHERE id = %s
-                        ''', (status, audio_file_path, history_id))
-                    else:
-                        cursor.execute('''
-                            UPDATE audio_history 
-                            SET processing_status = %s, updated_at = CURRENT_TIMESTAMP
-                            WHERE id = %s
-                        ''', (status, history_id))
-                    conn.commit()
-                    return cursor.rowcount > 0
+            with self._write_cursor(cursor) as cur:
+                if audio_file_path:
+                    cur.execute('''
+                        UPDATE audio_history 
+                        SET processing_status = %s, audio_file_path = %s, audio_generated = TRUE, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = %s
+                    ''', (status, audio_file_path, history_id))
+                else:
+                    cur.execute('''
+                        UPDATE audio_history 
+                        SET processing_status = %s, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = %s
+                    ''', (status, history_id))
+                return cur.rowcount > 0
         except Exception as e:
             logger.error(f"Error updating audio history status: {e}")
+            if cursor is not None:
+                raise
             return False
 
     def delete_audio_history(self, user_id, history_id):
@@ -565,14 +771,56 @@ class DatabaseManager:
             logger.error(f"Error deleting audio history: {e}")
             return False
 
+    def delete_audio_histories(self, user_id, history_ids):
+        """Delete several audio history entries of a user in one statement"""
+        history_ids = list(history_ids)
+        if not history_ids:
+            return 0
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    placeholders = ', '.join(['%s'] * len(history_ids))
+                    cursor.execute(f'''
+                        DELETE FROM audio_history 
+                        WHERE user_id = %s AND id IN ({placeholders})
+                    ''', (user_id, *history_ids))
+                    conn.commit()
+                    return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error deleting audio history entries: {e}")
+            return 0
+
     # Configuration Methods
+    def _get_reference_rows(self, key, query):
+        """Return the cached rows for a reference table, querying them when missing or stale"""
+        with self._cache_lock:
+            rows = self._reference_cache.get(key)
+        if rows is None:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(query)
+                    rows = list(cursor.fetchall())
+            with self._cache_lock:
+                self._reference_cache[key] = rows
+        return list(rows)
+
+    def warm_reference_cache(self):
+        """Load tones and voices into the cache ahead of their first use"""
+        try:
+            self._get_reference_rows('tones', 'SELECT * FROM tones WHERE is_active = TRUE ORDER BY tone_name')
+            self._get_reference_rows('voices', 'SELECT * FROM voices WHERE is_active = TRUE ORDER BY voice_name')
+        except Exception as e:
+            logger.warning(f"Could not preload tones and voices: {e}")
+
+    def invalidate_metadata_cache(self):
+        """Drop cached tones and voices; call after changing them"""
+        with self._cache_lock:
+            self._reference_cache.clear()
+
     def get_available_tones(self):
         """Get all available tones"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute('SELECT * FROM tones WHERE is_active = TRUE ORDER BY tone_name')
-                    return cursor.fetchall()
+            return self._get_reference_rows('tones', 'SELECT * FROM tones WHERE is_active = TRUE ORDER BY tone_name')
         except Exception as e:
             logger.error(f"Error getting tones: {e}")
             return []
@@ -580,10 +828,7 @@ class DatabaseManager:
     def get_available_voices(self):
         """Get all available voices"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute('SELECT * FROM voices WHERE is_active = TRUE ORDER BY voice_name')
-                    return cursor.fetchall()
+            return self._get_reference_rows('voices', 'SELECT * FROM voices WHERE is_active = TRUE ORDER BY voice_name')
         except Exception as e:
             logger.error(f"Error getting voices: {e}")
             return []
@@ -612,7 +857,41 @@ class DatabaseManager:
             logger.error(f"Error getting Watson voice ID: {e}")
             return None
 
+    def get_config_lookup(self, tone_id, voice_id):
+        """Get a tone's prompt template and a voice's Watson ID in one query"""
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute('''
+                        SELECT
+                            (SELECT prompt_template FROM tones WHERE tone_id = %s AND is_active = TRUE) AS prompt_template,
+                            (SELECT watson_voice_id FROM voices WHERE voice_id = %s AND is_active = TRUE) AS watson_voice_id
+                    ''', (tone_id, voice_id))
+                    result = cursor.fetchone()
+                    return result['prompt_template'], result['watson_voice_id']
+        except Exception as e:
+            logger.error(f"Error getting tone/voice configuration: {e}")
+            return None, None
+
     # Utility Methods
+    def get_user_profile_counts(self, user_id):
+        """Count a user's skills, interests, achievements, projects and audio history in one query"""
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute('''
+                        SELECT
+                            (SELECT COUNT(*) FROM user_skills WHERE user_id = %s) AS skills,
+                            (SELECT COUNT(*) FROM user_interests WHERE user_id = %s) AS interests,
+                            (SELECT COUNT(*) FROM user_achievements WHERE user_id = %s) AS achievements,
+                            (SELECT COUNT(*) FROM user_projects WHERE user_id = %s) AS projects,
+                            (SELECT COUNT(*) FROM audio_history WHERE user_id = %s) AS audio_history
+                    ''', (user_id,) * 5)
+                    return cursor.fetchone()
+        except Exception as e:
+            logger.error(f"Error getting user profile counts: {e}")
+            return {}
+
     def get_database_stats(self):
         """Get database statistics"""
         try:
@@ -752,13 +1031,16 @@ class DatabaseManager:
             logger.error(f"Error deleting download: {e}")
             return False
 
-    def test_connection(self):
-        """Test database connection"""
+    def test_connection(self, skip_if_recent=0):
+        """Test database connection; with skip_if_recent, skipped if the database answered within that many seconds"""
+        if skip_if_recent and time.monotonic() - self._last_connection_ok < skip_if_recent:
+            return True
         try:
             with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute('SELECT 1')
-                    return True
+                # COM_PING round-trip; no statement parsing or result set
+                conn.ping(False)
+                self._last_connection_ok = time.monotonic()
+                return True
         except Exception as e:
             logger.error(f"Database connection test failed: {e}")
             return False
@@ -776,33 +1058,59 @@ class DatabaseManager:
     def create_admin(self, name, email, password):
         """Create a new admin user"""
         try:
-            password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+            password_hash = self._hash_admin_password(password)
             
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
+                    # A duplicate email turns into a no-op update, reported as 0 affected rows
                     cursor.execute('''
                         INSERT INTO admins (name, email, password_hash)
                         VALUES (%s, %s, %s)
+                        ON DUPLICATE KEY UPDATE id = id
                     ''', (name, email, password_hash))
                     conn.commit()
+
+                    if cursor.rowcount == 0:
+                        logger.error(f"Admin with email {email} already exists")
+                        raise ValueError("Admin with this email already exists")
+
                     admin_id = cursor.lastrowid
-                    
                     logger.info(f"Admin created successfully with ID: {admin_id}")
                     return admin_id
-                    
-        except pymysql.err.IntegrityError as e:
-            if 'Duplicate entry' in str(e):
-                logger.error(f"Admin with email {email} already exists")
-                raise ValueError("Admin with this email already exists")
-            else:
-                logger.error(f"Database integrity error creating admin: {e}")
-                raise
+
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error creating admin: {e}")
             raise
 
     def authenticate_admin(self, email, password):
-        """Authenticate admin login"""
+        """Authenticate admin login, coalescing concurrent identical attempts"""
+        key = hashlib.sha256(email.lower().encode('utf-8') + b"|" + password.encode('utf-8')).digest()
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            admin = future.result()
+            return dict(admin) if admin else admin
+
+        try:
+            admin = self._authenticate_admin(email, password)
+            future.set_result(admin)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+        return dict(admin) if admin else admin
+
+    def _authenticate_admin(self, email, password):
+        """Look up the admin and verify the password with bcrypt"""
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
@@ -814,11 +1122,23 @@ class DatabaseManager:
                     
                     admin = cursor.fetchone()
                     
-                    if admin and bcrypt.checkpw(password.encode('utf-8'), admin['password_hash'].encode('utf-8')):
-                        # Update last login
-                        cursor.execute('''
-                            UPDATE admins SET last_login = NOW() WHERE id = %s
-                        ''', (admin['id'],))
+                    if not admin:
+                        # Spend the same bcrypt time as a real check so unknown emails aren't distinguishable
+                        bcrypt.checkpw(password.encode('utf-8'), self._get_dummy_hash())
+                        logger.warning(f"Failed admin authentication attempt: {email}")
+                        return None
+                    
+                    if bcrypt.checkpw(password.encode('utf-8'), admin['password_hash'].encode('utf-8')):
+                        if self._hash_cost(admin['password_hash']) != self._bcrypt_cost:
+                            # Progressive rehash to the configured cost
+                            cursor.execute('''
+                                UPDATE admins SET last_login = NOW(), password_hash = %s WHERE id = %s
+                            ''', (self._hash_admin_password(password), admin['id']))
+                        else:
+                            # Update last login
+                            cursor.execute('''
+                                UPDATE admins SET last_login = NOW() WHERE id = %s
+                            ''', (admin['id'],))
                         conn.commit()
                         
                         # Remove password hash from returned data
@@ -833,6 +1153,20 @@ class DatabaseManager:
             logger.error(f"Error authenticating admin: {e}")
             raise
 
+    def _get_dummy_hash(self):
+        """Hash at the configured cost used to verify logins for unknown admins"""
+        if self._dummy_hash is None:
+            self._dummy_hash = bcrypt.hashpw(b'echoverse-dummy-password', bcrypt.gensalt(self._bcrypt_cost))
+        return self._dummy_hash
+
+    @staticmethod
+    def _hash_cost(password_hash):
+        """Extract the work factor from a $2b$<cost>$... bcrypt hash"""
+        try:
+            return int(password_hash.split('$')[2])
+        except (IndexError, ValueError):
+            return None
+
     def get_admin_metrics(self):
         """Get admin dashboard metrics"""
         try:
@@ -845,7 +1179,7 @@ class DatabaseManager:
                     # Get new signups today
                     cursor.execute('''
                         SELECT COUNT(*) as count FROM users 
-                        WHERE DATE(created_at) = CURDATE()
+                        WHERE created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY
                     ''')
                     new_signups_today = cursor.fetchone()['count']
                     
@@ -904,20 +1238,7 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    # Create study_materials table if it doesn't exist
-                    cursor.execute("""
-                        CREATE TABLE IF NOT EXISTS study_materials (
-                            id INT AUTO_INCREMENT PRIMARY KEY,
-                            user_id INT NOT NULL,
-                            title VARCHAR(255) NOT NULL,
-                            content LONGTEXT NOT NULL,
-                            chapters JSON NOT NULL,
-                            file_type VARCHAR(100),
-                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-                        )
-                    """)
+                    self._create_study_materials_table(cursor)
                     
                     # Insert study material
                     cursor.execute("""
@@ -935,6 +1256,48 @@ class DatabaseManager:
             logger.error(f"Error saving study material: {e}")
             raise
 
+    def save_study_materials_bulk(self, user_id, items):
+        """Save several study materials in one statement; items are (title, content, chapters, file_type)"""
+        if not items:
+            return 0
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    self._create_study_materials_table(cursor)
+                    
+                    # executemany folds these rows into a single multi-row INSERT
+                    cursor.executemany("""
+                        INSERT INTO study_materials (user_id, title, content, chapters, file_type)
+                        VALUES (%s, %s, %s, %s, %s)
+                    """, [(user_id, *item) for item in items])
+                    
+                    count = cursor.rowcount
+                    conn.commit()
+                    
+                    logger.info(f"Saved {count} study materials for user {user_id}")
+                    return count
+                    
+        except Exception as e:
+            logger.error(f"Error saving study materials: {e}")
+            raise
+
+    def _create_study_materials_table(self, cursor):
+        """Create study_materials table if it doesn't exist"""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS study_materials (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                user_id INT NOT NULL,
+                title VARCHAR(255) NOT NULL,
+                content LONGTEXT NOT NULL,
+                chapters JSON NOT NULL,
+                file_type VARCHAR(100),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                INDEX idx_sm_user_updated (user_id, updated_at),
+                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+        """)
+
     def get_user_study_materials(self, user_id):
         """Get all study materials for a user"""
         try:
@@ -1,5 +1,21 @@
-import pymysql
+try:
+    # mysqlclient (libmysqlclient C extension) exposes a pymysql-compatible API; one difference:
+    # its connect() always enables CLIENT.MULTI_STATEMENTS, whatever client_flag is passed
+    import MySQLdb as pymysql
+    import MySQLdb.cursors
+    from MySQLdb.constants import CLIENT
+    HAS_MYSQLCLIENT = True
+except ImportError:
+    import pymysql
+    from pymysql.constants import CLIENT
+    HAS_MYSQLCLIENT = False
+from dbutils.pooled_db import PooledDB
+from cachetools import TTLCache
 import os
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
 from dotenv import load_dotenv
@@ -9,6 +25,53 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Secondary indexes the schema file leaves to the application: (table, index name, columns)
+INDEXES = [
+    ('audio_history', 'idx_audio_history_user_created', 'user_id, created_at'),
+    ('user_skills', 'idx_user_skills_user_created', 'user_id, created_at'),
+    ('user_interests', 'idx_user_interests_user_created', 'user_id, created_at'),
+    ('user_projects', 'idx_user_projects_user_created', 'user_id, created_at'),
+    ('user_achievements', 'idx_user_achievements_user_date', 'user_id, achievement_date, created_at'),
+]
+
+# Unique keys that let add_* methods dedupe server-side; added to existing tables when possible
+UNIQUE_INDEXES = [
+    ('user_skills', 'uq_user_skills_user_skill', 'user_id, skill_name'),
+    ('user_interests', 'uq_user_interests_user_interest', 'user_id, interest_name'),
+]
+
+# Columns update_user may set; keys are interpolated into SQL so they must be whitelisted
+ALLOWED_USER_COLS = frozenset({
+    'name', 'email', 'password_hash', 'phone', 'location', 'date_of_birth', 'university', 'course',
+    'year', 'roll_number', 'gpa', 'bio', 'is_verified', 'last_login'
+})
+
+# Tables holding per-user rows, deleted before the users row itself
+USER_CHILD_TABLES = ('user_skills', 'user_interests', 'user_achievements', 'user_projects', 'audio_history')
+
+# Explicit projections so list endpoints don't drag TEXT columns over the wire
+USER_COLS = ('id', 'name', 'email', 'phone', 'location', 'date_of_birth', 'university', 'course',
+             'year', 'roll_number', 'gpa', 'bio', 'created_at', 'updated_at')
+AUDIO_HISTORY_LIST_COLS = ('id', 'user_id', 'tone', 'voice', 'audio_file_path', 'audio_generated',
+                           'processing_status', 'created_at')
+
+# Hot single-row lookups, built once at import rather than per call
+SQL_GET_USER = f"SELECT {', '.join(USER_COLS)} FROM users WHERE id = %s"
+SQL_GET_USER_BY_EMAIL = f"SELECT {', '.join(USER_COLS)} FROM users WHERE email = %s"
+SQL_GET_TONES = 'SELECT * FROM tones WHERE is_active = TRUE ORDER BY tone_name'
+SQL_GET_VOICES = 'SELECT * FROM voices WHERE is_active = TRUE ORDER BY voice_name'
+SQL_GET_TONE_PROMPT = 'SELECT prompt_template FROM tones WHERE tone_id = %s AND is_active = TRUE'
+SQL_GET_VOICE_WATSON_ID = 'SELECT watson_voice_id FROM voices WHERE voice_id = %s AND is_active = TRUE'
+
+# All dashboard counters in one round-trip
+SQL_DATABASE_STATS = '''
+    SELECT
+        (SELECT COUNT(*) FROM users) AS users,
+        (SELECT COUNT(*) FROM audio_history) AS audio_history,
+        (SELECT COUNT(*) FROM tones WHERE is_active = TRUE) AS active_tones,
+        (SELECT COUNT(*) FROM voices WHERE is_active = TRUE) AS active_voices
+'''
+
 class DatabaseManager:
     def __init__(self):
         """Initialize database manager with MySQL database"""
@@ -19,12 +82,67 @@ class DatabaseManager:
             'password': os.getenv('DB_PASSWORD'),
             'database': os.getenv('DB_DATABASE'),
             'charset': 'utf8mb4',
-            'cursorclass': pymysql.cursors.DictCursor
+            'cursorclass': pymysql.cursors.DictCursor,
+            # Single writes commit on their own; multi-statement work uses transaction()
+            'autocommit': True
         }
+        # zlib protocol compression for large audio_history texts over slow links
+        self.compress = os.getenv('DB_COMPRESS', 'false').lower() in ('1', 'true', 'yes')
+        if self.compress and HAS_MYSQLCLIENT:
+            self.db_config['compress'] = True
+        elif self.compress:
+            logger.warning("DB_COMPRESS is set but pymysql does not support protocol compression; ignoring")
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._write_executor = None
+        self._write_executor_lock = threading.Lock()
+        self._update_user_sql_cache = {}
+        self._health_conn = None
+        self._health_lock = threading.Lock()
+        # Tones and voices are small and near-static; served from memory, refreshed periodically
+        self._reference_data = None
+        self._reference_ttl = int(os.getenv('DB_METADATA_CACHE_TTL', 300))
+        self._cache_lock = threading.Lock()
+        # The stats page is polled; a minute of staleness is fine
+        self._stats_cache = TTLCache(maxsize=1, ttl=60)
+        # Per-request user lookups; invalidated on update/delete
+        self._user_cache = TTLCache(maxsize=10000, ttl=int(os.getenv('DB_USER_CACHE_TTL', 60)))
+        self._user_cache_lock = threading.Lock()
+    
+    def _get_pool(self):
+        """Create the connection pool on first use"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = PooledDB(
+                        creator=pymysql,
+                        mincached=int(os.getenv('DB_POOL_MIN', 2)),
+                        maxcached=int(os.getenv('DB_POOL_MAX_IDLE', 10)),
+                        maxconnections=int(os.getenv('DB_POOL_SIZE', 20)),
+                        blocking=True,
+                        ping=1,
+                        **self.db_config
+                    )
+        return self._pool
     
     def get_connection(self):
-        """Get database connection"""
-        return pymysql.connect(**self.db_config)
+        """Get a pooled database connection; closing it returns it to the pool"""
+        return self._get_pool().connection()
+    
+    def close_pool(self):
+        """Finish queued background writes and close all pooled connections"""
+        with self._write_executor_lock:
+            if self._write_executor is not None:
+                self._write_executor.shutdown(wait=True)
+                self._write_executor = None
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+        with self._health_lock:
+            if self._health_conn is not None:
+                self._health_conn.close()
+                self._health_conn = None
     
     def ensure_database_exists(self):
         """Create database and tables if they don't exist"""
@@ -37,34 +155,69 @@ class DatabaseManager:
                 with conn.cursor() as cursor:
                     # Create database if it doesn't exist
                     cursor.execute(f"CREATE DATABASE IF NOT EXISTS {database_name}")
-                    conn.commit()
             
-            # Now connect to the specific database and create tables
-            with self.get_connection() as conn:
+            # Now connect to the specific database and create tables. The schema script needs
+            # multi-statement support; with PyMySQL only this bootstrap connection gets it, but
+            # mysqlclient's connect() always adds CLIENT.MULTI_STATEMENTS, pooled connections included.
+            with pymysql.connect(**self.db_config, client_flag=CLIENT.MULTI_STATEMENTS) as conn:
                 # Read and execute schema
                 schema_path = os.path.join(os.path.dirname(__file__), 'database', 'schema_mysql.sql')
                 if os.path.exists(schema_path):
                     with open(schema_path, 'r') as f:
-                        # Split the SQL file into individual statements
-                        statements = f.read().split(';')
-                        with conn.cursor() as cursor:
-                            for statement in statements:
-                                statement = statement.strip()
-                                if statement:
-                                    cursor.execute(statement)
-                            conn.commit()
+                        # Drop comment lines so no comment-only statement trails the last ';'
+                        script = '\n'.join(line for line in f.read().splitlines()
+                                           if not line.lstrip().startswith('--'))
+                    # Ship the whole schema in one packet and drain every result set
+                    with conn.cursor() as cursor:
+                        cursor.execute(script)
+                        while cursor.nextset():
+                            pass
                 else:
                     logger.warning(f"Schema file not found at {schema_path}")
                     self._create_basic_tables(conn)
+
+                self._ensure_indexes(conn)
+
+            try:
+                self.reload_reference_data()
+            except Exception as e:
+                logger.warning(f"Could not preload tones and voices: {e}")
                 
         except Exception as e:
             logger.error(f"Error ensuring database exists: {e}")
             raise
+
+    def _ensure_indexes(self, conn):
+        """Create secondary indexes that are missing on existing tables"""
+        with conn.cursor() as cursor:
+            cursor.execute('''
+                SELECT TABLE_NAME AS table_name FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = DATABASE()
+            ''')
+            tables = {row['table_name'] for row in cursor.fetchall()}
+
+            cursor.execute('''
+                SELECT DISTINCT TABLE_NAME AS table_name, INDEX_NAME AS index_name
+                FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE()
+            ''')
+            existing = {(row['table_name'], row['index_name']) for row in cursor.fetchall()}
+
+            wanted = [(t, i, c, '') for t, i, c in INDEXES] + [(t, i, c, 'UNIQUE ') for t, i, c in UNIQUE_INDEXES]
+            for table, index_name, columns, kind in wanted:
+                if table not in tables or (table, index_name) in existing:
+                    continue
+                try:
+                    cursor.execute(f'CREATE {kind}INDEX {index_name} ON {table} ({columns})')
+                    logger.info(f"Created index {index_name} on {table}")
+                except Exception as e:
+                    logger.warning(f"Could not create index {index_name} on {table}: {e}")
+            conn.commit()
     
     def _create_basic_tables(self, conn):
         """Create basic tables if schema file is not found"""
         with conn.cursor() as cursor:
-            # Users table
+            # Users and audio history tables in a single round-trip
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS users (
                     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -81,11 +234,8 @@ class DatabaseManager:
                     bio TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Audio history table
-            cursor.execute('''
+                );
+
                 CREATE TABLE IF NOT EXISTS audio_history (
                     id INT AUTO_INCREMENT PRIMARY KEY,
                     user_id INT NOT NULL,
@@ -101,9 +251,62 @@ class DatabaseManager:
                     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
                 )
             ''')
+            while cursor.nextset():
+                pass
             
             conn.commit()
 
+    @contextmanager
+    def transaction(self):
+        """Yield a pooled connection inside BEGIN ... COMMIT, rolling back on error"""
+        conn = self.get_connection()
+        try:
+            conn.begin()
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _bulk_insert(self, table, columns, rows, chunk_size=1000, skip_duplicates=False):
+        """Insert rows with multi-row INSERT statements, chunked to stay under max_allowed_packet"""
+        if not rows:
+            return 0
+        row_placeholder = '(' + ', '.join(['%s'] * len(columns)) + ')'
+        on_duplicate = 'ON DUPLICATE KEY UPDATE id = id' if skip_duplicates else ''
+        inserted = 0
+        with self.transaction() as conn:
+            with conn.cursor() as cursor:
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    query = f'''
+                        INSERT INTO {table} ({', '.join(columns)})
+                        VALUES {', '.join([row_placeholder] * len(chunk))}
+                        {on_duplicate}
+                    '''
+                    cursor.execute(query, [value for row in chunk for value in row])
+                    inserted += cursor.rowcount
+        return inserted
+
+    def _bulk_delete(self, table, user_id, ids, chunk_size=1000):
+        """Delete a user's rows by id with DELETE ... IN (...), chunked to stay under max_allowed_packet"""
+        ids = list(ids)
+        if not ids:
+            return 0
+        deleted = 0
+        with self.transaction() as conn:
+            with conn.cursor() as cursor:
+                for start in range(0, len(ids), chunk_size):
+                    chunk = ids[start:start + chunk_size]
+                    cursor.execute(f'''
+                        DELETE FROM {table} 
+                        WHERE user_id = %s AND id IN ({', '.join(['%s'] * len(chunk))})
+                    ''', [user_id, *chunk])
+                    deleted += cursor.rowcount
+        return deleted
+
     # User Management Methods
     def create_user(self, name, email, **kwargs):
         """Create a new user"""
@@ -122,7 +325,6 @@ class DatabaseManager:
                     '''
                     
                     cursor.execute(query, values)
-                    conn.commit()
                     return cursor.lastrowid
         except Exception as e:
             logger.error(f"Error creating user: {e}")
@@ -130,65 +332,94 @@ class DatabaseManager:
 
     def get_user(self, user_id):
         """Get user by ID"""
+        with self._user_cache_lock:
+            row = self._user_cache.get(('id', user_id))
+        if row is not None:
+            return dict(row)
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute('SELECT * FROM users WHERE id = %s', (user_id,))
-                    return cursor.fetchone()
+            row = self._fetch(SQL_GET_USER, (user_id,), one=True)
+            self._cache_user(row)
+            return row
         except Exception as e:
             logger.error(f"Error getting user: {e}")
             return None
 
     def get_user_by_email(self, email):
         """Get user by email"""
+        with self._user_cache_lock:
+            user_id = self._user_cache.get(('email', email))
+            row = self._user_cache.get(('id', user_id)) if user_id is not None else None
+        # The email entry only points at an id; re-check in case the address changed
+        if row is not None and row['email'] == email:
+            return dict(row)
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute('SELECT * FROM users WHERE email = %s', (email,))
-                    return cursor.fetchone()
+            row = self._fetch(SQL_GET_USER_BY_EMAIL, (email,), one=True)
+            self._cache_user(row)
+            return row
         except Exception as e:
             logger.error(f"Error getting user by email: {e}")
             return None
 
+    def _cache_user(self, row):
+        """Store a user row under its id, with an email -> id pointer"""
+        if not row:
+            return
+        with self._user_cache_lock:
+            self._user_cache[('id', row['id'])] = dict(row)
+            self._user_cache[('email', row['email'])] = row['id']
+
+    def invalidate_user(self, user_id):
+        """Drop a cached user; stale email pointers resolve to a miss"""
+        with self._user_cache_lock:
+            self._user_cache.pop(('id', user_id), None)
+
     def update_user(self, user_id, **kwargs):
         """Update user information"""
         if not kwargs:
             return False
             
         try:
+            fields = tuple(sorted(kwargs))
+            query = self._update_user_sql(fields)
+            values = [kwargs[field] for field in fields] + [user_id]
+            
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    # Build dynamic update statement
-                    set_clauses = []
-                    values = []
-                    
-                    for field, value in kwargs.items():
-                        set_clauses.append(f"{field} = %s")
-                        values.append(value)
-                    
-                    values.append(user_id)
-                    
-                    query = f'''
-                        UPDATE users 
-                        SET {', '.join(set_clauses)}, updated_at = CURRENT_TIMESTAMP
-                        WHERE id = %s
-                    '''
-                    
                     cursor.execute(query, values)
-                    conn.commit()
+                    self.invalidate_user(user_id)
                     return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error updating user: {e}")
             return False
 
+    def _update_user_sql(self, fields):
+        """Build (once per field set) the UPDATE statement for update_user"""
+        query = self._update_user_sql_cache.get(fields)
+        if query is None:
+            unknown = set(fields) - ALLOWED_USER_COLS
+            if unknown:
+                raise ValueError(f"Cannot update user fields: {', '.join(sorted(unknown))}")
+            query = f'''
+                UPDATE users 
+                SET {', '.join(f'{field} = %s' for field in fields)}, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            '''
+            self._update_user_sql_cache[fields] = query
+        return query
+
     def delete_user(self, user_id):
         """Delete user and all related data"""
         try:
-            with self.get_connection() as conn:
+            with self.transaction() as conn:
                 with conn.cursor() as cursor:
+                    # Range-delete children on their user_id index, then the parent,
+                    # so the cascade has nothing left to walk row by row
+                    for table in USER_CHILD_TABLES:
+                        cursor.execute(f'DELETE FROM {table} WHERE user_id = %s', (user_id,))
                     cursor.execute('DELETE FROM users WHERE id = %s', (user_id,))
-                    conn.commit()
-                    return cursor.rowcount > 0
+                    deleted = cursor.rowcount > 0
+            self.invalidate_user(user_id)
+            return deleted
         except Exception as e:
             logger.error(f"Error deleting user: {e}")
             return False
@@ -202,20 +433,30 @@ class DatabaseManager:
                     cursor.execute('''
                         INSERT INTO user_skills (user_id, skill_name)
                         VALUES (%s, %s)
+                        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
                     ''', (user_id, skill_name))
-                    conn.commit()
                     return cursor.lastrowid
         except Exception as e:
             logger.error(f"Error adding user skill: {e}")
             return None
 
+    def add_user_skills_bulk(self, user_id, skill_names):
+        """Add several skills to user profile in one statement"""
+        try:
+            return self._bulk_insert('user_skills', ('user_id', 'skill_name'),
+                                     [(user_id, name) for name in skill_names], skip_duplicates=True)
+        except Exception as e:
+            logger.error(f"Error adding user skills: {e}")
+            return 0
+
     def get_user_skills(self, user_id):
         """Get all skills for a user"""
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute('''
-                        SELECT * FROM user_skills 
+                        SELECT id, user_id, skill_name, created_at
+                        FROM user_skills 
                         WHERE user_id = %s 
                         ORDER BY created_at DESC
                     ''', (user_id,))
@@ -233,12 +474,19 @@ class DatabaseManager:
                         DELETE FROM user_skills 
                         WHERE id = %s AND user_id = %s
                     ''', (skill_id, user_id))
-                    conn.commit()
                     return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error removing user skill: {e}")
             return False
 
+    def remove_user_skills_bulk(self, user_id, skill_ids):
+        """Remove several skills from user profile in one statement"""
+        try:
+            return self._bulk_delete('user_skills', user_id, skill_ids)
+        except Exception as e:
+            logger.error(f"Error removing user skills: {e}")
+            return 0
+
     # User Interests Methods
     def add_user_interest(self, user_id, interest_name):
         """Add an interest to user profile"""
@@ -248,20 +496,30 @@ class DatabaseManager:
                     cursor.execute('''
                         INSERT INTO user_interests (user_id, interest_name)
                         VALUES (%s, %s)
+                        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
                     ''', (user_id, interest_name))
-                    conn.commit()
                     return cursor.lastrowid
         except Exception as e:
             logger.error(f"Error adding user interest: {e}")
             return None
 
+    def add_user_interests_bulk(self, user_id, interest_names):
+        """Add several interests to user profile in one statement"""
+        try:
+            return self._bulk_insert('user_interests', ('user_id', 'interest_name'),
+                                     [(user_id, name) for name in interest_names], skip_duplicates=True)
+        except Exception as e:
+            logger.error(f"Error adding user interests: {e}")
+            return 0
+
     def get_user_interests(self, user_id):
         """Get all interests for a user"""
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute('''
-                        SELECT * FROM user_interests 
+                        SELECT id, user_id, interest_name, created_at
+                        FROM user_interests 
                         WHERE user_id = %s 
                         ORDER BY created_at DESC
                     ''', (user_id,))
@@ -279,12 +537,19 @@ class DatabaseManager:
                         DELETE FROM user_interests 
                         WHERE id = %s AND user_id = %s
                     ''', (interest_id, user_id))
-                    conn.commit()
                     return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error removing user interest: {e}")
             return False
 
+    def remove_user_interests_bulk(self, user_id, interest_ids):
+        """Remove several interests from user profile in one statement"""
+        try:
+            return self._bulk_delete('user_interests', user_id, interest_ids)
+        except Exception as e:
+            logger.error(f"Error removing user interests: {e}")
+            return 0
+
     # User Achievements Methods
     def add_user_achievement(self, user_id, achievement_text, achievement_date=None):
         """Add an achievement to user profile"""
@@ -295,19 +560,28 @@ class DatabaseManager:
                         INSERT INTO user_achievements (user_id, achievement_text, achievement_date)
                         VALUES (%s, %s, %s)
                     ''', (user_id, achievement_text, achievement_date))
-                    conn.commit()
                     return cursor.lastrowid
         except Exception as e:
             logger.error(f"Error adding user achievement: {e}")
             return None
 
+    def add_user_achievements_bulk(self, user_id, achievements):
+        """Add several achievements; items are (achievement_text, achievement_date)"""
+        try:
+            return self._bulk_insert('user_achievements', ('user_id', 'achievement_text', 'achievement_date'),
+                                     [(user_id, text, date) for text, date in achievements])
+        except Exception as e:
+            logger.error(f"Error adding user achievements: {e}")
+            return 0
+
     def get_user_achievements(self, user_id):
         """Get all achievements for a user"""
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute('''
-                        SELECT * FROM user_achievements 
+                        SELECT id, user_id, achievement_text, achievement_date, created_at
+                        FROM user_achievements 
                         WHERE user_id = %s 
                         ORDER BY achievement_date DESC, created_at DESC
                     ''', (user_id,))
@@ -325,12 +599,19 @@ class DatabaseManager:
                         DELETE FROM user_achievements 
                         WHERE id = %s AND user_id = %s
                     ''', (achievement_id, user_id))
-                    conn.commit()
                     return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error removing user achievement: {e}")
             return False
 
+    def remove_user_achievements_bulk(self, user_id, achievement_ids):
+        """Remove several achievements from user profile in one statement"""
+        try:
+            return self._bulk_delete('user_achievements', user_id, achievement_ids)
+        except Exception as e:
+            logger.error(f"Error removing user achievements: {e}")
+            return 0
+
     # User Projects Methods
     def add_user_project(self, user_id, project_name, description=None, technologies=None, project_url=None):
         """Add a project to user profile"""
@@ -341,19 +622,29 @@ class DatabaseManager:
                         INSERT INTO user_projects (user_id, project_name, description, technologies, project_url)
                         VALUES (%s, %s, %s, %s, %s)
                     ''', (user_id, project_name, description, technologies, project_url))
-                    conn.commit()
                     return cursor.lastrowid
         except Exception as e:
             logger.error(f"Error adding user project: {e}")
             return None
 
+    def add_user_projects_bulk(self, user_id, projects):
+        """Add several projects; items are dicts with project_name, description, technologies, project_url"""
+        try:
+            return self._bulk_insert('user_projects', ('user_id', 'project_name', 'description', 'technologies', 'project_url'),
+                                     [(user_id, p['project_name'], p.get('description'), p.get('technologies'), p.get('project_url'))
+                                      for p in projects])
+        except Exception as e:
+            logger.error(f"Error adding user projects: {e}")
+            return 0
+
     def get_user_projects(self, user_id):
         """Get all projects for a user"""
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute('''
-                        SELECT * FROM user_projects 
+                        SELECT id, user_id, project_name, description, technologies, project_url, created_at
+                        FROM user_projects 
                         WHERE user_id = %s 
                         ORDER BY created_at DESC
                     ''', (user_id,))
@@ -371,12 +662,19 @@ class DatabaseManager:
                         DELETE FROM user_projects 
                         WHERE id = %s AND user_id = %s
                     ''', (project_id, user_id))
-                    conn.commit()
                     return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error removing user project: {e}")
             return False
 
+    def remove_user_projects_bulk(self, user_id, project_ids):
+        """Remove several projects from user profile in one statement"""
+        try:
+            return self._bulk_delete('user_projects', user_id, project_ids)
+        except Exception as e:
+            logger.error(f"Error removing user projects: {e}")
+            return 0
+
     # Audio History Methods
     def save_audio_history(self, user_id, original_text, rewritten_text, tone, voice, audio_file_path=None):
         """Save audio generation history"""
@@ -388,19 +686,30 @@ class DatabaseManager:
                         (user_id, original_text, rewritten_text, tone, voice, audio_file_path, audio_generated)
                         VALUES (%s, %s, %s, %s, %s, %s, %s)
                     ''', (user_id, original_text, rewritten_text, tone, voice, audio_file_path, audio_file_path is not None))
-                    conn.commit()
                     return cursor.lastrowid
         except Exception as e:
             logger.error(f"Error saving audio history: {e}")
             return None
 
+    def save_audio_history_bulk(self, user_id, entries):
+        """Save several history entries; items are (original_text, rewritten_text, tone, voice, audio_file_path)"""
+        try:
+            return self._bulk_insert('audio_history',
+                                     ('user_id', 'original_text', 'rewritten_text', 'tone', 'voice', 'audio_file_path', 'audio_generated'),
+                                     [(user_id, original, rewritten, tone, voice, path, path is not None)
+                                      for original, rewritten, tone, voice, path in entries])
+        except Exception as e:
+            logger.error(f"Error saving audio history entries: {e}")
+            return 0
+
     def get_user_audio_history(self, user_id, limit=50):
         """Get audio history for a user"""
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute('''
-                        SELECT * FROM audio_history 
+                    cursor.execute(f'''
+                        SELECT {', '.join(AUDIO_HISTORY_LIST_COLS)}
+                        FROM audio_history 
                         WHERE user_id = %s 
                         ORDER BY created_at DESC 
                         LIMIT %s
@@ -410,6 +719,53 @@ class DatabaseManager:
             logger.error(f"Error getting audio history: {e}")
             return []
 
+    def iter_user_audio_history(self, user_id, limit=None):
+        """Stream a user's audio history rows from the server without buffering them all"""
+        query = f'''
+            SELECT {', '.join(AUDIO_HISTORY_LIST_COLS)}
+            FROM audio_history 
+            WHERE user_id = %s 
+            ORDER BY created_at DESC
+        '''
+        params = [user_id]
+        if limit is not None:
+            query += ' LIMIT %s'
+            params.append(limit)
+        with self.get_connection() as conn:
+            with conn.cursor(pymysql.cursors.SSDictCursor) as cursor:
+                cursor.execute(query, params)
+                yield from cursor
+
+    def get_audio_history_detail(self, history_id, user_id=None):
+        """Get a full audio history entry, including original and rewritten text"""
+        try:
+            query = 'SELECT * FROM audio_history WHERE id = %s'
+            params = [history_id]
+            if user_id is not None:
+                query += ' AND user_id = %s'
+                params.append(user_id)
+            return self._fetch(query, params, one=True)
+        except Exception as e:
+            logger.error(f"Error getting audio history detail: {e}")
+            return None
+
+    def _submit_write(self, fn, *args, **kwargs):
+        """Run a write on the background executor and return its Future"""
+        with self._write_executor_lock:
+            # Under the lock so racing callers share one executor and close_pool can't drop it mid-submit
+            if self._write_executor is None:
+                self._write_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv('DB_WRITE_WORKERS', 4)), thread_name_prefix='db-write')
+            return self._write_executor.submit(fn, *args, **kwargs)
+
+    def save_audio_history_async(self, *args, **kwargs):
+        """Queue save_audio_history off the request path; the Future resolves to the row id"""
+        return self._submit_write(self.save_audio_history, *args, **kwargs)
+
+    def update_audio_history_status_async(self, *args, **kwargs):
+        """Queue update_audio_history_status off the request path"""
+        return self._submit_write(self.update_audio_history_status, *args, **kwargs)
+
     def update_audio_history_status(self, history_id, status, audio_file_path=None):
         """Update audio history processing status"""
         try:
@@ -427,7 +783,6 @@ class DatabaseManager:
                             SET processing_status = %s, updated_at = CURRENT_TIMESTAMP
                             WHERE id = %s
                         ''', (status, history_id))
-                    conn.commit()
                     return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error updating audio history status: {e}")
@@ -442,20 +797,70 @@ class DatabaseManager:
                         DELETE FROM audio_history 
                         WHERE id = %s AND user_id = %s
                     ''', (history_id, user_id))
-                    conn.commit()
                     return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error deleting audio history: {e}")
             return False
 
     # Configuration Methods
+    def _cached(self, key, fn, cache):
+        """Return the cached value for key, calling fn to fill it on a miss"""
+        with self._cache_lock:
+            if key in cache:
+                return cache[key]
+        value = fn()
+        with self._cache_lock:
+            cache[key] = value
+        return value
+
+    def _fetch(self, query, params=None, one=False):
+        """Run a read query on a pooled connection"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchone() if one else cursor.fetchall()
+
+    def _tuple_cursor(self, conn):
+        """Plain tuple cursor for scalar lookups, skipping per-row dict construction"""
+        return conn.cursor(pymysql.cursors.Cursor)
+
+    def _fetch_value(self, query, params=None):
+        """Run a query and return the first column of the first row, or None"""
+        with self.get_connection() as conn:
+            with self._tuple_cursor(conn) as cursor:
+                cursor.execute(query, params)
+                row = cursor.fetchone()
+                return row[0] if row else None
+
+    def _get_reference_data(self):
+        """Return the in-memory tones/voices, loading them on first use or when stale"""
+        reference = self._reference_data
+        if reference is None or time.monotonic() - reference['loaded_at'] > self._reference_ttl:
+            reference = self.reload_reference_data()
+        return reference
+
+    def reload_reference_data(self):
+        """Load active tones and voices into memory; call after changing reference data"""
+        tones = list(self._fetch(SQL_GET_TONES))
+        voices = list(self._fetch(SQL_GET_VOICES))
+        reference = {
+            'tones': tones,
+            'voices': voices,
+            'tones_by_id': {tone['tone_id']: tone for tone in tones},
+            'voices_by_id': {voice['voice_id']: voice for voice in voices},
+            'loaded_at': time.monotonic(),
+        }
+        self._reference_data = reference
+        return reference
+
+    def invalidate_metadata_cache(self):
+        """Drop in-memory tones/voices so the next read reloads them"""
+        self._reference_data = None
+
     def get_available_tones(self):
         """Get all available tones"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute('SELECT * FROM tones WHERE is_active = TRUE ORDER BY tone_name')
-                    return cursor.fetchall()
+            return list(self._get_reference_data()['tones'])
         except Exception as e:
             logger.error(f"Error getting tones: {e}")
             return []
@@ -463,10 +868,7 @@ class DatabaseManager:
     def get_available_voices(self):
         """Get all available voices"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute('SELECT * FROM voices WHERE is_active = TRUE ORDER BY voice_name')
-                    return cursor.fetchall()
+            return list(self._get_reference_data()['voices'])
         except Exception as e:
             logger.error(f"Error getting voices: {e}")
             return []
@@ -474,11 +876,11 @@ class DatabaseManager:
     def get_tone_prompt(self, tone_id):
         """Get prompt template for a specific tone"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute('SELECT prompt_template FROM tones WHERE tone_id = %s AND is_active = TRUE', (tone_id,))
-                    result = cursor.fetchone()
-                    return result['prompt_template'] if result else None
+            tone = self._get_reference_data()['tones_by_id'].get(tone_id)
+            if tone is not None:
+                return tone['prompt_template']
+            # Not loaded yet (e.g. added since the last reload)
+            return self._fetch_value(SQL_GET_TONE_PROMPT, (tone_id,))
         except Exception as e:
             logger.error(f"Error getting tone prompt: {e}")
             return None
@@ -486,11 +888,10 @@ class DatabaseManager:
     def get_voice_watson_id(self, voice_id):
         """Get Watson voice ID for a specific voice"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute('SELECT watson_voice_id FROM voices WHERE voice_id = %s AND is_active = TRUE', (voice_id,))
-                    result = cursor.fetchone()
-                    return result['watson_voice_id'] if result else None
+            voice = self._get_reference_data()['voices_by_id'].get(voice_id)
+            if voice is not None:
+                return voice['watson_voice_id']
+            return self._fetch_value(SQL_GET_VOICE_WATSON_ID, (voice_id,))
         except Exception as e:
             logger.error(f"Error getting Watson voice ID: {e}")
             return None
@@ -499,27 +900,8 @@ class DatabaseManager:
     def get_database_stats(self):
         """Get database statistics"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    stats = {}
-                    
-                    # Count users
-                    cursor.execute('SELECT COUNT(*) as count FROM users')
-                    stats['users'] = cursor.fetchone()['count']
-                    
-                    # Count audio history
-                    cursor.execute('SELECT COUNT(*) as count FROM audio_history')
-                    stats['audio_history'] = cursor.fetchone()['count']
-                    
-                    # Count tones
-                    cursor.execute('SELECT COUNT(*) as count FROM tones WHERE is_active = TRUE')
-                    stats['active_tones'] = cursor.fetchone()['count']
-                    
-                    # Count voices
-                    cursor.execute('SELECT COUNT(*) as count FROM voices WHERE is_active = TRUE')
-                    stats['active_voices'] = cursor.fetchone()['count']
-                    
-                    return stats
+            return dict(self._cached('database_stats', lambda: self._fetch(SQL_DATABASE_STATS, one=True),
+                                     cache=self._stats_cache))
         except Exception as e:
             logger.error(f"Error getting database stats: {e}")
             return {}
@@ -527,10 +909,12 @@ class DatabaseManager:
     def test_connection(self):
         """Test database connection"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute('SELECT 1')
-                    return True
+            # Health probes reuse one long-lived connection instead of a handshake per check
+            with self._health_lock:
+                if self._health_conn is None:
+                    self._health_conn = pymysql.connect(**self.db_config)
+                self._health_conn.ping(True)
+            return True
         except Exception as e:
             logger.error(f"Database connection test failed: {e}")
             return False
@@ -1,14 +1,108 @@
 import sqlite3
 import os
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from itertools import islice
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Stamped into PRAGMA user_version once database/schema.sql has been applied; bump when the schema changes
+SCHEMA_VERSION = 1
+
+# Seconds to serve tones/voices from memory before re-reading them
+REFERENCE_CACHE_TTL = 60
+
+# Profiles kept in the get_user_by_email LRU
+USER_CACHE_SIZE = 1024
+
+# Default SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds
+SQLITE_MAX_VARIABLES = 999
+
+# Keys of a project dict, in user_projects column order
+PROJECT_KEYS = ('name', 'description', 'tech')
+
+# Static statements, built once at import rather than per call
+INSERT_USER_QUERY = """
+    INSERT INTO users (name, email, phone, location, date_of_birth, 
+                     university, course, year, roll_number, gpa, bio)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+UPDATE_USER_QUERY = """
+    UPDATE users SET name = ?, phone = ?, location = ?, date_of_birth = ?,
+                   university = ?, course = ?, year = ?, roll_number = ?, 
+                   gpa = ?, bio = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+GET_USER_SKILLS_QUERY = "SELECT skill_name FROM user_skills WHERE user_id = ?"
+GET_USER_INTERESTS_QUERY = "SELECT interest_name FROM user_interests WHERE user_id = ?"
+GET_USER_ACHIEVEMENTS_QUERY = "SELECT achievement_text FROM user_achievements WHERE user_id = ?"
+GET_USER_PROJECTS_QUERY = "SELECT project_name, description, technologies FROM user_projects WHERE user_id = ?"
+CREATE_AUDIO_HISTORY_QUERY = """
+    INSERT INTO audio_history (user_id, original_text, rewritten_text, tone, voice, audio_generated)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+GET_USER_AUDIO_HISTORY_QUERY = """
+    SELECT * FROM audio_history 
+    WHERE user_id = ? 
+    ORDER BY created_at DESC 
+    LIMIT ?
+"""
+UPDATE_AUDIO_GENERATED_QUERY = """
+    UPDATE audio_history 
+    SET audio_generated = TRUE, audio_file_path = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+DELETE_AUDIO_HISTORY_QUERY = "DELETE FROM audio_history WHERE id = ? AND user_id = ?"
+GET_TONES_QUERY = "SELECT * FROM tones WHERE is_active = TRUE"
+GET_VOICES_QUERY = "SELECT * FROM voices WHERE is_active = TRUE"
+
+# User row plus child lists aggregated as JSON arrays, so a profile load is one query
+USER_WITH_CHILDREN_QUERY = """
+    SELECT u.*,
+        (SELECT json_group_array(skill_name)
+         FROM (SELECT skill_name FROM user_skills WHERE user_id = u.id ORDER BY id)) AS skills,
+        (SELECT json_group_array(interest_name)
+         FROM (SELECT interest_name FROM user_interests WHERE user_id = u.id ORDER BY id)) AS interests,
+        (SELECT json_group_array(achievement_text)
+         FROM (SELECT achievement_text FROM user_achievements WHERE user_id = u.id ORDER BY id)) AS achievements,
+        (SELECT json_group_array(json_object('name', project_name, 'description', description, 'tech', technologies))
+         FROM (SELECT project_name, description, technologies FROM user_projects WHERE user_id = u.id ORDER BY id)) AS projects
+    FROM users u
+    WHERE u.email = ?
+"""
+
+# Skills, interests, achievements and projects as one compound SELECT; "kind" says which list a row belongs to
+USER_CHILDREN_SELECT = """
+    SELECT 'skill' AS kind, user_id, id, skill_name AS v1, NULL AS v2, NULL AS v3 FROM user_skills WHERE user_id {cond}
+    UNION ALL
+    SELECT 'interest', user_id, id, interest_name, NULL, NULL FROM user_interests WHERE user_id {cond}
+    UNION ALL
+    SELECT 'achievement', user_id, id, achievement_text, NULL, NULL FROM user_achievements WHERE user_id {cond}
+    UNION ALL
+    SELECT 'project', user_id, id, project_name, description, technologies FROM user_projects WHERE user_id {cond}
+    ORDER BY id
+"""
+GET_USER_CHILDREN_QUERY = USER_CHILDREN_SELECT.format(cond='= ?')
+
 class DatabaseManager:
     def __init__(self, db_path='database/echoverse.db'):
         """Initialize database manager with SQLite database"""
         self.db_path = db_path
+        # One long-lived connection per thread; sqlite3 connections aren't safe to share
+        self._local = threading.local()
+        # (expires_at, rows) for the near-static tones/voices tables
+        self._tones_cache = None
+        self._voices_cache = None
+        # email -> profile dict, least recently used first
+        self._user_cache = OrderedDict()
+        self._user_cache_lock = threading.Lock()
+        # Bumped on every invalidation; a read that started before one must not fill the cache
+        self._user_cache_gen = 0
         self.ensure_database_exists()
     
     def ensure_database_exists(self):
@@ -18,12 +112,23 @@ class DatabaseManager:
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
             
             # Create database and tables
-            with sqlite3.connect(self.db_path) as conn:
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                # Already bootstrapped by an earlier process: skip reading and running the schema
+                if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                    return
+                
+                # WAL is persistent in the file header, so setting it once here is enough
+                conn.execute("PRAGMA journal_mode=WAL")
+                
                 # Read and execute schema
                 schema_path = os.path.join(os.path.dirname(__file__), 'database', 'schema.sql')
                 if os.path.exists(schema_path):
                     with open(schema_path, 'r') as f:
-                        conn.executescript(f.read())
+                        # Exclusive so concurrently starting workers apply it one at a time
+                        conn.executescript(
+                            f"BEGIN EXCLUSIVE;\n{f.read()}\n"
+                            f"PRAGMA user_version = {SCHEMA_VERSION};\nCOMMIT;"
+                        )
                 else:
                     logger.warning(f"Schema file not found at {schema_path}")
                     self._create_basic_tables(conn)
@@ -55,43 +160,118 @@ class DatabaseManager:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(id)
             );
+            
+            CREATE INDEX IF NOT EXISTS idx_audio_history_user_created ON audio_history(user_id, created_at);
         """)
     
     def get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
+        """Get this thread's database connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; multi-statement writes use _transaction(). A larger statement
+            # cache keeps every query this class issues compiled for the connection's lifetime.
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                                   cached_statements=256)
+            conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
+            # Per-connection settings; journal_mode=WAL is set once in ensure_database_exists
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
         return conn
     
+    @contextmanager
+    def _transaction(self):
+        """Run the enclosed statements in one explicit BEGIN IMMEDIATE/COMMIT"""
+        conn = self.get_connection()
+        # Take the write lock up front so the transaction can't fail to upgrade midway
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    def _exec(self, sql, params=()):
+        """Lean execute on this thread's connection for hot reads; errors propagate to the caller"""
+        conn = getattr(self._local, 'conn', None) or self.get_connection()
+        return conn.execute(sql, params)
+    
     def execute_query(self, query, params=None, fetch_one=False, fetch_all=False):
         """Execute a query and return results"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                if params:
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
+            cursor = self.get_connection().cursor()
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
                 
-                if fetch_one:
-                    return dict(cursor.fetchone()) if cursor.fetchone() else None
-                elif fetch_all:
-                    return [dict(row) for row in cursor.fetchall()]
-                else:
-                    conn.commit()
-                    return cursor.lastrowid
+            if fetch_one:
+                row = cursor.fetchone()
+                return dict(row) if row else None
+            elif fetch_all:
+                rows = cursor.fetchall()
+                if not rows:
+                    return []
+                # Column names once per result set rather than per row
+                keys = rows[0].keys()
+                return [dict(zip(keys, row)) for row in rows]
+            else:
+                # Autocommit connection: the write is durable once execute returns
+                return cursor.lastrowid
         except Exception as e:
             logger.error(f"Database query failed: {e}")
             raise
     
+    def _insert_rows(self, conn, table, columns, rows):
+        """Insert any iterable of rows with multi-row VALUES statements, chunked under SQLite's 999-variable limit"""
+        rows_per_statement = SQLITE_MAX_VARIABLES // len(columns)
+        row_placeholder = '(' + ', '.join('?' * len(columns)) + ')'
+        rows = iter(rows)
+        # Only one statement's worth of rows is materialized at a time
+        while chunk := list(islice(rows, rows_per_statement)):
+            conn.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([row_placeholder] * len(chunk))}",
+                [value for row in chunk for value in row]
+            )
+    
+    def _sync_rows(self, conn, table, columns, user_id, rows):
+        """Make a user's rows in table equal rows, deleting and inserting only the difference"""
+        existing = {}
+        for row in conn.execute(f"SELECT id, {', '.join(columns)} FROM {table} WHERE user_id = ?", (user_id,)):
+            existing.setdefault(tuple(row[1:]), []).append(row[0])
+        
+        to_add = []
+        for row in rows:
+            # Match each wanted row to an unused existing one; duplicates are counted
+            ids = existing.get(tuple(row))
+            if ids:
+                ids.pop()
+            else:
+                to_add.append((user_id, *row))
+        
+        to_delete = [row_id for ids in existing.values() for row_id in ids]
+        for start in range(0, len(to_delete), SQLITE_MAX_VARIABLES):
+            chunk = to_delete[start:start + SQLITE_MAX_VARIABLES]
+            conn.execute(f"DELETE FROM {table} WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+        if to_add:
+            self._insert_rows(conn, table, ('user_id', *columns), to_add)
+    
+    def execute_query_iter(self, query, params=None):
+        """Yield result rows one at a time as sqlite3.Row (mapping-like) without materializing the set"""
+        cursor = self.get_connection().execute(query, params or ())
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
+    
     # User management methods
     def create_user(self, user_data):
         """Create a new user"""
-        query = """
-            INSERT INTO users (name, email, phone, location, date_of_birth, 
-                             university, course, year, roll_number, gpa, bio)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
+        query = INSERT_USER_QUERY
         params = (
             user_data.get('name'),
             user_data.get('email'),
@@ -105,44 +285,116 @@ class DatabaseManager:
             user_data.get('gpa'),
             user_data.get('bio')
         )
-        user_id = self.execute_query(query, params)
-        
-        # Add skills, interests, achievements, and projects
-        if user_data.get('skills'):
-            self.update_user_skills(user_id, user_data['skills'])
-        if user_data.get('interests'):
-            self.update_user_interests(user_id, user_data['interests'])
-        if user_data.get('achievements'):
-            self.update_user_achievements(user_id, user_data['achievements'])
-        if user_data.get('projects'):
-            self.update_user_projects(user_id, user_data['projects'])
+        with self._transaction() as conn:
+            user_id = conn.execute(query, params).lastrowid
+            
+            # Add skills, interests, achievements, and projects in the same transaction
+            if user_data.get('skills'):
+                self._update_user_skills_tx(conn, user_id, user_data['skills'])
+            if user_data.get('interests'):
+                self._update_user_interests_tx(conn, user_id, user_data['interests'])
+            if user_data.get('achievements'):
+                self._update_user_achievements_tx(conn, user_id, user_data['achievements'])
+            if user_data.get('projects'):
+                self._update_user_projects_tx(conn, user_id, user_data['projects'])
         
+        self.invalidate_user(user_data.get('email'))
         return user_id
     
     def get_user_by_email(self, email):
-        """Get user by email"""
-        query = "SELECT * FROM users WHERE email = ?"
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (email,))
-            user = cursor.fetchone()
-            if user:
-                user_dict = dict(user)
-                user_dict['skills'] = self.get_user_skills(user_dict['id'])
-                user_dict['interests'] = self.get_user_interests(user_dict['id'])
-                user_dict['achievements'] = self.get_user_achievements(user_dict['id'])
-                user_dict['projects'] = self.get_user_projects(user_dict['id'])
-                return user_dict
-            return None
+        """Get user by email, with skills, interests, achievements and projects in one query"""
+        with self._user_cache_lock:
+            user_dict = self._user_cache.get(email)
+            if user_dict is not None:
+                self._user_cache.move_to_end(email)
+                return self._copy_user(user_dict)
+            gen = self._user_cache_gen
+        
+        cursor = self.get_connection().cursor()
+        cursor.execute(USER_WITH_CHILDREN_QUERY, (email,))
+        user = cursor.fetchone()
+        if user:
+            user_dict = dict(user)
+            for key in ('skills', 'interests', 'achievements', 'projects'):
+                user_dict[key] = json.loads(user_dict[key])
+            with self._user_cache_lock:
+                # Skip the fill if a write invalidated profiles while this row was being read
+                if gen == self._user_cache_gen:
+                    self._user_cache[email] = user_dict
+                    if len(self._user_cache) > USER_CACHE_SIZE:
+                        self._user_cache.popitem(last=False)
+            return self._copy_user(user_dict)
+        return None
+    
+    @staticmethod
+    def _copy_user(user_dict):
+        """Copy a cached profile so callers can't mutate the cache"""
+        user = dict(user_dict)
+        for key in ('skills', 'interests', 'achievements'):
+            user[key] = list(user[key])
+        user['projects'] = [dict(project) for project in user['projects']]
+        return user
+    
+    def invalidate_user(self, email):
+        """Drop a cached profile, e.g. after changing the user outside this manager"""
+        with self._user_cache_lock:
+            self._user_cache_gen += 1
+            self._user_cache.pop(email, None)
+    
+    def _invalidate_user_id(self, user_id):
+        """Drop the cached profile of a user known only by id"""
+        # Even with nothing to drop, a read already in flight must not cache its row
+        with self._user_cache_lock:
+            self._user_cache_gen += 1
+        if not self._user_cache:
+            return
+        row = self._exec("SELECT email FROM users WHERE id = ?", (user_id,)).fetchone()
+        if row:
+            self.invalidate_user(row[0])
+    
+    def get_users_by_ids(self, user_ids):
+        """Get several users with their child rows: two queries per chunk instead of 1+4N"""
+        user_ids = list(user_ids)
+        users = {}
+        conn = self.get_connection()
+        # The children query binds each id four times; stay under SQLite's bound-variable limit
+        step = SQLITE_MAX_VARIABLES // 4
+        for start in range(0, len(user_ids), step):
+            chunk = user_ids[start:start + step]
+            placeholders = ', '.join('?' * len(chunk))
+            for row in conn.execute(f"SELECT * FROM users WHERE id IN ({placeholders})", chunk):
+                user = dict(row)
+                user.update(skills=[], interests=[], achievements=[], projects=[])
+                users[user['id']] = user
+            
+            query = USER_CHILDREN_SELECT.format(cond=f"IN ({placeholders})")
+            for row in conn.execute(query, chunk * 4):
+                self._add_child_row(users[row[1]], row)
+        return [users[user_id] for user_id in user_ids if user_id in users]
+    
+    def get_user_children(self, user_id):
+        """Get skills, interests, achievements and projects of a user in a single query"""
+        children = {'skills': [], 'interests': [], 'achievements': [], 'projects': []}
+        for row in self._exec(GET_USER_CHILDREN_QUERY, (user_id,) * 4):
+            self._add_child_row(children, row)
+        return children
+    
+    @staticmethod
+    def _add_child_row(target, row):
+        """Append a (kind, user_id, id, v1, v2, v3) children row to the matching list"""
+        kind = row[0]
+        if kind == 'skill':
+            target['skills'].append(row[3])
+        elif kind == 'interest':
+            target['interests'].append(row[3])
+        elif kind == 'achievement':
+            target['achievements'].append(row[3])
+        else:
+            target['projects'].append(dict(zip(PROJECT_KEYS, row[3:])))
     
     def update_user(self, user_id, user_data):
         """Update user information"""
-        query = """
-            UPDATE users SET name = ?, phone = ?, location = ?, date_of_birth = ?,
-                           university = ?, course = ?, year = ?, roll_number = ?, 
-                           gpa = ?, bio = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """
+        query = UPDATE_USER_QUERY
         params = (
             user_data.get('name'),
             user_data.get('phone'),
@@ -156,145 +408,172 @@ class DatabaseManager:
             user_data.get('bio'),
             user_id
         )
-        self.execute_query(query, params)
-        
-        # Update related data
-        if 'skills' in user_data:
-            self.update_user_skills(user_id, user_data['skills'])
-        if 'interests' in user_data:
-            self.update_user_interests(user_id, user_data['interests'])
-        if 'achievements' in user_data:
-            self.update_user_achievements(user_id, user_data['achievements'])
-        if 'projects' in user_data:
-            self.update_user_projects(user_id, user_data['projects'])
+        with self._transaction() as conn:
+            conn.execute(query, params)
+            
+            # Update related data in the same transaction: one commit per profile save
+            if 'skills' in user_data:
+                self._update_user_skills_tx(conn, user_id, user_data['skills'])
+            if 'interests' in user_data:
+                self._update_user_interests_tx(conn, user_id, user_data['interests'])
+            if 'achievements' in user_data:
+                self._update_user_achievements_tx(conn, user_id, user_data['achievements'])
+            if 'projects' in user_data:
+                self._update_user_projects_tx(conn, user_id, user_data['projects'])
+        self._invalidate_user_id(user_id)
     
     def get_user_skills(self, user_id):
         """Get user skills"""
-        query = "SELECT skill_name FROM user_skills WHERE user_id = ?"
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (user_id,))
-            return [row[0] for row in cursor.fetchall()]
+        return [row[0] for row in self._exec(GET_USER_SKILLS_QUERY, (user_id,))]
     
     def update_user_skills(self, user_id, skills):
         """Update user skills"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            # Delete existing skills
-            cursor.execute("DELETE FROM user_skills WHERE user_id = ?", (user_id,))
-            # Insert new skills
-            for skill in skills:
-                cursor.execute("INSERT INTO user_skills (user_id, skill_name) VALUES (?, ?)", 
-                             (user_id, skill))
-            conn.commit()
+        with self._transaction() as conn:
+            self._update_user_skills_tx(conn, user_id, skills)
+        self._invalidate_user_id(user_id)
+    
+    def _update_user_skills_tx(self, conn, user_id, skills):
+        """Sync user skills inside the caller's transaction"""
+        self._sync_rows(conn, 'user_skills', ('skill_name',), user_id, ((skill,) for skill in skills))
     
     def get_user_interests(self, user_id):
         """Get user interests"""
-        query = "SELECT interest_name FROM user_interests WHERE user_id = ?"
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (user_id,))
-            return [row[0] for row in cursor.fetchall()]
+        return [row[0] for row in self._exec(GET_USER_INTERESTS_QUERY, (user_id,))]
     
     def update_user_interests(self, user_id, interests):
         """Update user interests"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM user_interests WHERE user_id = ?", (user_id,))
-            for interest in interests:
-                cursor.execute("INSERT INTO user_interests (user_id, interest_name) VALUES (?, ?)", 
-                             (user_id, interest))
-            conn.commit()
+        with self._transaction() as conn:
+            self._update_user_interests_tx(conn, user_id, interests)
+        self._invalidate_user_id(user_id)
+    
+    def _update_user_interests_tx(self, conn, user_id, interests):
+        """Sync user interests inside the caller's transaction"""
+        self._sync_rows(conn, 'user_interests', ('interest_name',), user_id, ((interest,) for interest in interests))
     
     def get_user_achievements(self, user_id):
         """Get user achievements"""
-        query = "SELECT achievement_text FROM user_achievements WHERE user_id = ?"
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (user_id,))
-            return [row[0] for row in cursor.fetchall()]
+        return [row[0] for row in self._exec(GET_USER_ACHIEVEMENTS_QUERY, (user_id,))]
     
     def update_user_achievements(self, user_id, achievements):
         """Update user achievements"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM user_achievements WHERE user_id = ?", (user_id,))
-            for achievement in achievements:
-                cursor.execute("INSERT INTO user_achievements (user_id, achievement_text) VALUES (?, ?)", 
-                             (user_id, achievement))
-            conn.commit()
+        with self._transaction() as conn:
+            self._update_user_achievements_tx(conn, user_id, achievements)
+        self._invalidate_user_id(user_id)
+    
+    def _update_user_achievements_tx(self, conn, user_id, achievements):
+        """Sync user achievements inside the caller's transaction"""
+        self._sync_rows(conn, 'user_achievements', ('achievement_text',), user_id,
+                        ((achievement,) for achievement in achievements))
     
     def get_user_projects(self, user_id):
         """Get user projects"""
-        query = "SELECT project_name, description, technologies FROM user_projects WHERE user_id = ?"
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (user_id,))
-            return [{'name': row[0], 'description': row[1], 'tech': row[2]} for row in cursor.fetchall()]
+        return [dict(zip(PROJECT_KEYS, row)) for row in self._exec(GET_USER_PROJECTS_QUERY, (user_id,))]
     
     def update_user_projects(self, user_id, projects):
         """Update user projects"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM user_projects WHERE user_id = ?", (user_id,))
-            for project in projects:
-                cursor.execute("""INSERT INTO user_projects (user_id, project_name, description, technologies) 
-                                VALUES (?, ?, ?, ?)""", 
-                             (user_id, project.get('name'), project.get('description'), project.get('tech')))
-            conn.commit()
+        with self._transaction() as conn:
+            self._update_user_projects_tx(conn, user_id, projects)
+        self._invalidate_user_id(user_id)
+    
+    def _update_user_projects_tx(self, conn, user_id, projects):
+        """Sync user projects inside the caller's transaction"""
+        self._sync_rows(conn, 'user_projects', ('project_name', 'description', 'technologies'), user_id,
+                        ((project.get('name'), project.get('description'), project.get('tech'))
+                         for project in projects))
     
     # Audio history methods
     def create_audio_history(self, user_id, original_text, rewritten_text, tone, voice, audio_generated=False):
         """Create audio history entry"""
-        query = """
-            INSERT INTO audio_history (user_id, original_text, rewritten_text, tone, voice, audio_generated)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """
+        query = CREATE_AUDIO_HISTORY_QUERY
         params = (user_id, original_text, rewritten_text, tone, voice, audio_generated)
         return self.execute_query(query, params)
     
+    def create_audio_histories_bulk(self, user_id, records):
+        """Create several audio history entries for a user in one transaction; records are dicts like create_audio_history's arguments"""
+        rows = [(user_id, record['original_text'], record['rewritten_text'], record['tone'], record['voice'],
+                 record.get('audio_generated', False))
+                for record in records]
+        with self._transaction() as conn:
+            self._insert_rows(conn, 'audio_history',
+                              ('user_id', 'original_text', 'rewritten_text', 'tone', 'voice', 'audio_generated'), rows)
+        return len(rows)
+    
     def get_user_audio_history(self, user_id, limit=50):
         """Get user's audio history"""
-        query = """
-            SELECT * FROM audio_history 
-            WHERE user_id = ? 
-            ORDER BY created_at DESC 
-            LIMIT ?
-        """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (user_id, limit))
-            return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in self._exec(GET_USER_AUDIO_HISTORY_QUERY, (user_id, limit))]
+    
+    def get_audio_histories(self, user_ids, limit_per_user=50):
+        """Get the latest audio history of several users in one query per 900 ids, keyed by user_id"""
+        user_ids = list(user_ids)
+        histories = {user_id: [] for user_id in user_ids}
+        conn = self.get_connection()
+        for start in range(0, len(user_ids), 900):
+            chunk = user_ids[start:start + 900]
+            query = f"""
+                SELECT * FROM (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY created_at DESC, id DESC) AS rn
+                    FROM audio_history
+                    WHERE user_id IN ({', '.join('?' * len(chunk))})
+                )
+                WHERE rn <= ?
+                ORDER BY user_id, rn
+            """
+            for row in conn.execute(query, (*chunk, limit_per_user)):
+                entry = dict(row)
+                del entry['rn']
+                histories[entry['user_id']].append(entry)
+        return histories
+    
+    def iter_user_audio_history(self, user_id, limit=None):
+        """Stream a user's audio history as sqlite3.Row objects, newest first"""
+        query = "SELECT * FROM audio_history WHERE user_id = ? ORDER BY created_at DESC"
+        params = (user_id,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        return self.execute_query_iter(query, params)
     
     def update_audio_generated(self, history_id, audio_file_path=None):
         """Update audio generation status"""
-        query = """
-            UPDATE audio_history 
-            SET audio_generated = TRUE, audio_file_path = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """
+        query = UPDATE_AUDIO_GENERATED_QUERY
         self.execute_query(query, (audio_file_path, history_id))
     
     def delete_audio_history(self, history_id, user_id):
         """Delete audio history entry"""
-        query = "DELETE FROM audio_history WHERE id = ? AND user_id = ?"
+        query = DELETE_AUDIO_HISTORY_QUERY
         self.execute_query(query, (history_id, user_id))
     
     def get_tones(self):
         """Get all available tones"""
-        query = "SELECT * FROM tones WHERE is_active = TRUE"
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query)
-            return [dict(row) for row in cursor.fetchall()]
+        cached = self._tones_cache
+        if cached and cached[0] > time.monotonic():
+            return list(cached[1])
+        query = GET_TONES_QUERY
+        cursor = self.get_connection().cursor()
+        cursor.execute(query)
+        tones = [dict(row) for row in cursor.fetchall()]
+        self._tones_cache = (time.monotonic() + REFERENCE_CACHE_TTL, tones)
+        return list(tones)
     
     def get_voices(self):
         """Get all available voices"""
-        query = "SELECT * FROM voices WHERE is_active = TRUE"
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query)
-            return [dict(row) for row in cursor.fetchall()]
+        cached = self._voices_cache
+        if cached and cached[0] > time.monotonic():
+            return list(cached[1])
+        query = GET_VOICES_QUERY
+        cursor = self.get_connection().cursor()
+        cursor.execute(query)
+        voices = [dict(row) for row in cursor.fetchall()]
+        self._voices_cache = (time.monotonic() + REFERENCE_CACHE_TTL, voices)
+        return list(voices)
+    
+    def invalidate_tones(self):
+        """Drop cached tones after they are changed"""
+        self._tones_cache = None
+    
+    def invalidate_voices(self):
+        """Drop cached voices after they are changed"""
+        self._voices_cache = None
 
 # Initialize database manager
 db_manager = DatabaseManager()
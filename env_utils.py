@@ -0,0 +1,68 @@
+"""
+Shared .env helpers for the EchoVerse setup scripts
+"""
+
+import os
+import re
+
+# .env text per path, reused while the file on disk is unchanged
+_env_cache = {}
+
+# Compiled key-matching patterns per set of keys
+_pattern_cache = {}
+
+def _key_pattern(keys):
+    """Return the compiled multiline pattern matching KEY=... lines for keys"""
+    keys = tuple(keys)
+    pattern = _pattern_cache.get(keys)
+    if pattern is None:
+        pattern = re.compile(r'^[ \t]*(' + '|'.join(map(re.escape, keys)) + r')[ \t]*=.*$', re.M)
+        _pattern_cache[keys] = pattern
+    return pattern
+
+def read_env(env_path='.env'):
+    """Return the text of the .env file, or '' if it doesn't exist"""
+    try:
+        stat = os.stat(env_path)
+    except FileNotFoundError:
+        return ''
+    cached = _env_cache.get(env_path)
+    if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
+    with open(env_path, 'r') as f:
+        text = f.read()
+    _env_cache[env_path] = ((stat.st_mtime_ns, stat.st_size), text)
+    return text
+
+def write_env(text, env_path='.env'):
+    """Atomically replace the .env file with text, keeping its permissions"""
+    # Write to a temp file and rename so an interrupted run can't truncate .env
+    tmp_path = env_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    if os.path.exists(env_path):
+        os.chmod(tmp_path, os.stat(env_path).st_mode & 0o777)
+    os.replace(tmp_path, env_path)
+    stat = os.stat(env_path)
+    _env_cache[env_path] = ((stat.st_mtime_ns, stat.st_size), text)
+
+def update_env(values, env_path='.env'):
+    """Set each key in values in the .env file, updating existing lines in place and appending new ones"""
+    keys_found = set()
+
+    def replace(match):
+        key = match.group(1)
+        keys_found.add(key)
+        return f"{key}={values[key]}"
+
+    env_text = _key_pattern(values).sub(replace, read_env(env_path))
+
+    # Add any missing keys
+    missing = ''.join(f"{key}={value}\n" for key, value in values.items() if key not in keys_found)
+    if missing and env_text and not env_text.endswith('\n'):
+        env_text += '\n'
+
+    write_env(env_text + missing, env_path)
+
+    # Expose the new values to in-process tests (load_dotenv won't override them)
+    os.environ.update(values)
@@ -4,7 +4,15 @@ Comprehensive test of EchoVerse API endpoints with Hugging Face integration
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import os
+
+BASE_URL = 'http://localhost:5000'
+
+# One keep-alive session for every call so requests reuse the same socket
+session = requests.Session()
+session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 def test_echoverse_api():
     print("=== COMPREHENSIVE ECHOVERSE API TEST ===\n")
@@ -12,11 +20,12 @@ def test_echoverse_api():
     # Test 1: Text Rewriting
     print("1. Testing /rewrite endpoint...")
     try:
-        response = requests.post('http://localhost:5000/rewrite', 
+        response = session.post(f'{BASE_URL}/rewrite', 
                                json={
                                    'text': 'This is a simple story about a young adventurer who discovered a magical forest.',
                                    'tone': 'inspiring'
-                               })
+                               },
+                               timeout=30)
         print(f"   Status: {response.status_code}")
         if response.status_code == 200:
             result = response.json()
@@ -31,20 +40,30 @@ def test_echoverse_api():
 
     print("\n2. Testing /synthesize endpoint...")
     try:
-        response = requests.post('http://localhost:5000/synthesize', 
-                               json={'text': 'Welcome to EchoVerse! Your AI-powered audiobook companion is ready to transform any text into engaging audio content.'})
-        print(f"   Status: {response.status_code}")
-        print(f"   Content-Type: {response.headers.get('content-type')}")
-        print(f"   Audio Size: {len(response.content)} bytes")
-        
-        if response.status_code == 200 and len(response.content) > 1000:
-            print("   ✅ SUCCESS! TTS working perfectly!")
-            with open('echoverse_demo.wav', 'wb') as f:
-                f.write(response.content)
-            print("   Demo audio saved as echoverse_demo.wav")
-        else:
-            error_msg = response.text if response.status_code != 200 else "Audio too small"
-            print(f"   ❌ FAILED: {error_msg}")
+        # Stream the WAV straight to disk instead of buffering it in response.content
+        with session.post(f'{BASE_URL}/synthesize', 
+                          json={'text': 'Welcome to EchoVerse! Your AI-powered audiobook companion is ready to transform any text into engaging audio content.'},
+                          timeout=60, stream=True) as response:
+            print(f"   Status: {response.status_code}")
+            print(f"   Content-Type: {response.headers.get('content-type')}")
+            
+            if response.status_code != 200:
+                print(f"   ❌ FAILED: {response.text}")
+            else:
+                bytes_written = 0
+                with open('echoverse_demo.wav.part', 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+                        bytes_written += len(chunk)
+                print(f"   Audio Size: {bytes_written} bytes")
+                
+                if bytes_written > 1000:
+                    os.replace('echoverse_demo.wav.part', 'echoverse_demo.wav')
+                    print("   ✅ SUCCESS! TTS working perfectly!")
+                    print("   Demo audio saved as echoverse_demo.wav")
+                else:
+                    os.remove('echoverse_demo.wav.part')
+                    print("   ❌ FAILED: Audio too small")
     except Exception as e:
         print(f"   ❌ ERROR: {e}")
 
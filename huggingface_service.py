@@ -5,24 +5,204 @@ Uses IBM Granite models and TTS models via Hugging Face Inference API
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import logging
 import tempfile
-import base64
-from typing import Optional, Dict, Any
+import hashlib
+import io
+import queue
+import wave
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from collections import OrderedDict
+from contextlib import suppress
+from pathlib import Path
+from typing import Optional, Dict, Iterator
 from dotenv import load_dotenv
 
+# orjson serializes request payloads several times faster than the stdlib json module
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+# audioop is stdlib up to Python 3.12; without it TTS_COMPACT_WAV is a no-op
+try:
+    import audioop
+except ImportError:
+    audioop = None
+
+# Optional: HTTP/2 client for multiplexing concurrent Hugging Face calls over one connection
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 # Reload environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Generation parameters for rewrite_text, serialized once
+_REWRITE_PARAMETERS_JSON = _json_dumps({
+    "max_new_tokens": 150,
+    "temperature": 0.7,
+    "do_sample": True
+})
+
+# Seconds test_connection waits for each probe
+HEALTH_CHECK_TIMEOUT = 5
+
+# Seconds rewrite_text waits for a batched rewrite before falling back to the tone tag
+REWRITE_BATCH_TIMEOUT = 60
+
+# Sample rate TTS_COMPACT_WAV resamples speech to; plenty for voice
+COMPACT_WAV_RATE = 16000
+
+# Bytes per chunk yielded by synthesize_speech_stream
+STREAM_CHUNK_SIZE = 16384
+
+# Seconds a TTS model is skipped after an error without an estimated warm-up time
+TTS_MODEL_COOLDOWN = 30
+
+# Models listed by get_available_models (informational; not fetched from Hugging Face)
+_AVAILABLE_MODELS = {
+    "text_models": (
+        "ibm-granite/granite-3.3-8b-instruct",
+        "ibm-granite/granite-speech-3.3-8b",
+        "ibm-granite/granite-speech-3.3-2b"
+    ),
+    "tts_models": (
+        "microsoft/speecht5_tts",
+        "facebook/fastspeech2-en-ljspeech",
+        "espnet/kan-bayashi_ljspeech_vits"
+    )
+}
+
+# Tone-specific prompts for text rewriting
+_TONE_PROMPTS = {
+    'neutral': "Rewrite this text in a clear, professional tone:",
+    'suspenseful': "Rewrite this text to create suspense and drama:",
+    'inspiring': "Rewrite this text in an uplifting, motivational tone:",
+    'cheerful': "Rewrite this text in a bright, happy tone:",
+    'sad': "Rewrite this text in a soft, emotional tone:",
+    'angry': "Rewrite this text with intensity and passion:",
+    'playful': "Rewrite this text in a fun, lively tone:",
+    'calm': "Rewrite this text in a relaxed, peaceful tone:",
+    'confident': "Rewrite this text in an assured, authoritative tone:"
+}
+
+# "[TONE]" prefixes for un-rewritten text, built once instead of per fallback
+_TONE_TAG = {t: f"[{t.upper()}]" for t in _TONE_PROMPTS}
+
+# Enhanced tone-specific speech parameters for better audio quality
+_TONE_SETTINGS = {
+    'neutral': {'rate': 160, 'volume': 0.9, 'pitch': 0},
+    'cheerful': {'rate': 180, 'volume': 0.95, 'pitch': 5},
+    'confident': {'rate': 150, 'volume': 0.95, 'pitch': 0},
+    'suspenseful': {'rate': 130, 'volume': 0.8, 'pitch': -5},
+    'inspiring': {'rate': 170, 'volume': 0.95, 'pitch': 3},
+    'sad': {'rate': 120, 'volume': 0.7, 'pitch': -8},
+    'angry': {'rate': 190, 'volume': 1.0, 'pitch': 2},
+    'playful': {'rate': 185, 'volume': 0.9, 'pitch': 7},
+    'calm': {'rate': 140, 'volume': 0.8, 'pitch': -2},
+    'professional': {'rate': 155, 'volume': 0.9, 'pitch': 0},
+    'dramatic': {'rate': 135, 'volume': 0.85, 'pitch': -3}
+}
+
+# Scratch directory for local TTS output; None means the system default temp dir
+_TTS_TEMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Enhanced voice mapping for all available Windows voices
+_VOICE_PREFERENCES = {
+    'david': {
+        'keywords': ['david', 'male', 'man'],
+        'gender': 'male',
+        'index': 0  # David is typically at index 0
+    },
+    'zira': {
+        'keywords': ['zira', 'female', 'woman'],
+        'gender': 'female',
+        'index': 1  # Zira is typically at index 1
+    },
+    'heera': {
+        'keywords': ['heera', 'female', 'woman'],
+        'gender': 'female',
+        'index': 2  # Heera may be at index 2
+    },
+    'mark': {
+        'keywords': ['mark', 'male', 'man'],
+        'gender': 'male',
+        'index': 3  # Mark may be at index 3
+    },
+    'ravi': {
+        'keywords': ['ravi', 'male', 'man'],
+        'gender': 'male',
+        'index': 4  # Ravi may be at index 4
+    },
+    # Legacy mappings for backward compatibility
+    'lisa': {
+        'keywords': ['zira', 'female', 'woman', 'lisa'],
+        'gender': 'female',
+        'index': 1  # Maps to Zira
+    },
+    'michael': {
+        'keywords': ['david', 'male', 'man', 'michael'],
+        'gender': 'male',
+        'index': 0  # Maps to David
+    },
+    'allison': {
+        'keywords': ['heera', 'female', 'woman', 'allison'],
+        'gender': 'female', 
+        'index': 2  # Maps to Heera
+    }
+}
+
+class _LRU:
+    """Thread-safe LRU mapping, optionally bounded by the total size of bytes values"""
+    
+    def __init__(self, n: int = 256, max_bytes: Optional[int] = None):
+        self._c = OrderedDict()
+        self._n = n
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            value = self._c.get(key)
+            if value is not None:
+                self._c.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        size = len(value) if isinstance(value, bytes) else 0
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        with self._lock:
+            old = self._c.pop(key, None)
+            if isinstance(old, bytes):
+                self._bytes -= len(old)
+            self._c[key] = value
+            self._bytes += size
+            while len(self._c) > self._n or (self._max_bytes is not None and self._bytes > self._max_bytes):
+                _, evicted = self._c.popitem(last=False)
+                if isinstance(evicted, bytes):
+                    self._bytes -= len(evicted)
+
 class HuggingFaceService:
     """Service for interacting with Hugging Face APIs"""
     
+    # Concurrent synths share CPU (local engine) or the endpoint and slow each other down; size to cores per engine
+    _tts_concurrency = int(os.getenv('TTS_CONCURRENCY', '1'))
+    _tts_semaphore = threading.BoundedSemaphore(value=_tts_concurrency)
+    
     def __init__(self):
-        # Reload environment to ensure latest values
-        load_dotenv()
         self.api_token = os.getenv('HUGGINGFACE_API_TOKEN')
         self.text_model = os.getenv('HUGGINGFACE_TEXT_MODEL', 'ibm-granite/granite-3.3-8b-instruct')
         # Use high-quality TTS models
@@ -35,6 +215,12 @@ class HuggingFaceService:
             'suno/bark'
         ]
         self.base_url = "https://api-inference.huggingface.co/models"
+        # Per-model circuit breaker: cold or failing models are skipped until cold_until
+        self._model_state = {m: {'cold_until': 0, 'last_ok': 0} for m in self.tts_models}
+        self._model_lock = threading.Lock()
+        # Opt-in: how many warm TTS models to query at once (1 = strictly one after another)
+        self.tts_race_models = int(os.getenv('TTS_RACE_MODELS', '1'))
+        self._race_executor = None
         
         # Debug logging
         logger.info(f"Hugging Face token loaded: {'Yes' if self.api_token and self.api_token.startswith('hf_') else 'No'}")
@@ -42,6 +228,73 @@ class HuggingFaceService:
         if not self.api_token or self.api_token == 'hf_your_token_here':
             logger.warning("Hugging Face API token not configured")
             self.api_token = None
+        
+        # Opt-in: let the inference gateway answer repeated TTS inputs from its result cache
+        self.use_server_cache = os.getenv('HF_USE_CACHE', 'false').lower() == 'true'
+        
+        # Seconds to wait for a TCP connection; an unreachable endpoint fails fast instead of
+        # sitting out the (long, cold-start friendly) read timeout
+        self.connect_timeout = float(os.getenv('HF_CONNECT_TIMEOUT', '3.05'))
+        
+        # One keep-alive session so TCP/TLS setup is paid once, not per inference call
+        self.session = requests.Session()
+        self._headers = self._get_headers()
+        self.session.headers.update(self._headers)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            # Inference calls are idempotent, so retrying POST on gateway errors is safe
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                              allowed_methods=frozenset(['GET', 'POST']), raise_on_status=False)
+        )
+        self.session.mount('https://', adapter)
+        
+        # HF_HTTP2=true swaps in an httpx HTTP/2 client (same post/get/response interface)
+        if os.getenv('HF_HTTP2', 'false').lower() == 'true':
+            if httpx is None:
+                logger.warning("HF_HTTP2 is set but httpx is not installed; using HTTP/1.1 keep-alive")
+            else:
+                try:
+                    transport = httpx.HTTPTransport(
+                        http2=True,
+                        retries=2,
+                        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+                    )
+                    self.session = httpx.Client(
+                        headers=self._headers,
+                        timeout=httpx.Timeout(90.0, connect=self.connect_timeout),
+                        transport=transport
+                    )
+                except ImportError:
+                    logger.warning("HF_HTTP2 needs the h2 package (pip install 'httpx[http2]'); using HTTP/1.1 keep-alive")
+        
+        # Repeated phrases skip the round-trip to Hugging Face; audio is also capped by total size
+        self.text_cache = _LRU(256)
+        self.audio_cache = _LRU(128, max_bytes=int(os.getenv('TTS_CACHE_MAX_BYTES', str(64 * 1024 * 1024))))
+        # Hugging Face audio is also kept on disk so restarts start warm; TTS_DISK_CACHE_DIR= (empty) disables it
+        cache_dir = os.getenv('TTS_DISK_CACHE_DIR', '~/.cache/echoverse/tts')
+        self.audio_cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        # Oldest files are evicted once the directory grows past this many bytes
+        self.disk_cache_max_bytes = int(os.getenv('TTS_DISK_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+        self._disk_cache_bytes = None
+        self._disk_cache_lock = threading.Lock()
+        
+        # Opt-in: resample speech to 16 kHz before returning it (about 27% fewer bytes than 22.05 kHz)
+        self.compact_wav = os.getenv('TTS_COMPACT_WAV', 'false').lower() == 'true'
+        
+        # Opt-in micro-batching of concurrent rewrites into one request (1 = off)
+        self.rewrite_batch_size = int(os.getenv('HF_REWRITE_BATCH_SIZE', '1'))
+        self.rewrite_batch_wait = int(os.getenv('HF_REWRITE_BATCH_WAIT_MS', '25')) / 1000
+        self._batch_queue = queue.Queue()
+        self._batch_lock = threading.Lock()
+        self._batch_thread = None
+        
+        # pyttsx3 engine shared by all local TTS calls, created on first use
+        self._engine = None
+        self._voices = None
+        self._voice_id_by_name = {}
+        self._voice_id_by_gender = {}
+        self._engine_lock = threading.RLock()
     
     def _get_headers(self) -> Dict[str, str]:
         """Get API headers with authentication"""
@@ -50,26 +303,29 @@ class HuggingFaceService:
         }
         if self.api_token:
             headers['Authorization'] = f'Bearer {self.api_token}'
+        if self.use_server_cache:
+            headers['x-use-cache'] = 'true'
         return headers
     
-    def _make_request(self, model_name: str, payload: Dict[str, Any], timeout: int = 30) -> Optional[requests.Response]:
-        """Make request to Hugging Face Inference API"""
+    def _make_request(self, model_name: str, payload, timeout: int = 30) -> Optional[requests.Response]:
+        """Make request to Hugging Face Inference API; payload is a dict or already-serialized JSON bytes"""
         try:
             url = f"{self.base_url}/{model_name}"
-            headers = self._get_headers()
+            body = payload if isinstance(payload, bytes) else _json_dumps(payload)
             
-            logger.info(f"Making request to Hugging Face: {model_name}")
-            logger.debug(f"URL: {url}")
-            logger.debug(f"Headers: {headers}")
+            # %-style args so nothing is formatted when the level is off
+            logger.info("Making request to Hugging Face: %s", model_name)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("URL: %s", url)
             
-            response = requests.post(
-                url,
-                headers=headers,
-                json=payload,
-                timeout=timeout
-            )
+            # Content-Type: application/json is already set on the session
+            if isinstance(self.session, requests.Session):
+                response = self.session.post(url, data=body, timeout=(self.connect_timeout, timeout))
+            else:
+                response = self.session.post(url, content=body,
+                                             timeout=httpx.Timeout(timeout, connect=self.connect_timeout))
             
-            logger.info(f"Hugging Face response status: {response.status_code}")
+            logger.info("Hugging Face response status: %s", response.status_code)
             if response.status_code != 200:
                 logger.error(f"Hugging Face API error: {response.text}")
             
@@ -79,6 +335,21 @@ class HuggingFaceService:
             logger.error(f"Error making request to Hugging Face: {e}")
             return None
     
+    def _build_rewrite_prompt(self, text: str, tone: str) -> str:
+        """Build the tone-specific rewriting prompt for text"""
+        prompt_template = _TONE_PROMPTS.get(tone, _TONE_PROMPTS['neutral'])
+        return f"{prompt_template}\n\nText: {text}\n\nRewritten:"
+    
+    def _rewrite_payload(self, inputs) -> bytes:
+        """Serialized text generation payload for one prompt or a list of prompts"""
+        # Only the inputs vary; the parameters object is spliced in pre-serialized
+        return b'{"inputs":' + _json_dumps(inputs) + b',"parameters":' + _REWRITE_PARAMETERS_JSON + b'}'
+    
+    @staticmethod
+    def _fallback_rewrite(text: str, tone: str) -> str:
+        """Tag text with its tone when no rewrite could be generated"""
+        return f"{_TONE_TAG.get(tone) or f'[{tone.upper()}]'} {text}"
+    
     def rewrite_text(self, text: str, tone: str) -> str:
         """
         Rewrite text using Hugging Face model with specified tone
@@ -87,32 +358,23 @@ class HuggingFaceService:
             logger.info("Using mock rewriting (no Hugging Face token)")
             return f"[{tone.upper()} TONE] {text}"
         
+        cache_key = hashlib.md5(f"{text}|{tone}".encode()).digest()
+        cached = self.text_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        if self.rewrite_batch_size > 1:
+            future = self.rewrite_text_async(text, tone)
+            try:
+                return future.result(timeout=REWRITE_BATCH_TIMEOUT)
+            except FutureTimeoutError:
+                future.cancel()
+                logger.error("Batched text rewriting timed out")
+                return self._fallback_rewrite(text, tone)
+        
         try:
-            # Tone-specific prompts for text rewriting
-            tone_prompts = {
-                'neutral': "Rewrite this text in a clear, professional tone:",
-                'suspenseful': "Rewrite this text to create suspense and drama:",
-                'inspiring': "Rewrite this text in an uplifting, motivational tone:",
-                'cheerful': "Rewrite this text in a bright, happy tone:",
-                'sad': "Rewrite this text in a soft, emotional tone:",
-                'angry': "Rewrite this text with intensity and passion:",
-                'playful': "Rewrite this text in a fun, lively tone:",
-                'calm': "Rewrite this text in a relaxed, peaceful tone:",
-                'confident': "Rewrite this text in an assured, authoritative tone:"
-            }
-            
-            prompt_template = tone_prompts.get(tone, tone_prompts['neutral'])
-            full_prompt = f"{prompt_template}\n\nText: {text}\n\nRewritten:"
-            
-            # Use text generation format for FLAN-T5
-            payload = {
-                "inputs": full_prompt,
-                "parameters": {
-                    "max_new_tokens": 150,
-                    "temperature": 0.7,
-                    "do_sample": True
-                }
-            }
+            full_prompt = self._build_rewrite_prompt(text, tone)
+            payload = self._rewrite_payload(full_prompt)
             
             response = self._make_request(self.text_model, payload)
             
@@ -125,72 +387,330 @@ class HuggingFaceService:
                     if generated_text:
                         # Remove the original prompt from the response
                         clean_text = generated_text.replace(full_prompt, '').strip()
-                        return clean_text if clean_text else f"[{tone.upper()}] {text}"
+                        if clean_text:
+                            self.text_cache.put(cache_key, clean_text)
+                            return clean_text
+                        return self._fallback_rewrite(text, tone)
                     else:
-                        return f"[{tone.upper()}] {text}"
+                        return self._fallback_rewrite(text, tone)
                 else:
                     logger.error(f"Unexpected response format: {result}")
-                    return f"[{tone.upper()}] {text}"
+                    return self._fallback_rewrite(text, tone)
             else:
                 error_msg = response.text if response else "No response"
                 logger.error(f"Hugging Face text generation failed: {error_msg}")
-                return f"[{tone.upper()}] {text}"
+                return self._fallback_rewrite(text, tone)
                 
         except Exception as e:
             logger.error(f"Error in text rewriting: {e}")
-            return f"[{tone.upper()}] {text}"
+            return self._fallback_rewrite(text, tone)
+    
+    def rewrite_text_async(self, text: str, tone: str) -> Future:
+        """
+        Queue text for rewriting and return a Future; concurrent calls are sent to Hugging Face as one batch
+        """
+        future = Future()
+        if not self.api_token or self.rewrite_batch_size <= 1:
+            future.set_result(self.rewrite_text(text, tone))
+            return future
+        
+        cache_key = hashlib.md5(f"{text}|{tone}".encode()).digest()
+        cached = self.text_cache.get(cache_key)
+        if cached is not None:
+            future.set_result(cached)
+            return future
+        
+        with self._batch_lock:
+            if self._batch_thread is None:
+                self._batch_thread = threading.Thread(target=self._batch_worker, name='hf-rewrite-batcher', daemon=True)
+                self._batch_thread.start()
+        self._batch_queue.put((text, tone, cache_key, future))
+        return future
+    
+    def _batch_worker(self):
+        """Collect queued rewrites for up to rewrite_batch_wait seconds and send them together"""
+        while True:
+            batch = [self._batch_queue.get()]
+            deadline = time.monotonic() + self.rewrite_batch_wait
+            while len(batch) < self.rewrite_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._batch_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            # Claim each Future; ones the caller already cancelled are dropped
+            batch = [item for item in batch if item[3].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                self._run_rewrite_batch(batch)
+            except Exception as e:
+                # Keep the worker alive; anything left unresolved gets the fallback
+                logger.error(f"Error in batch worker: {e}")
+                for text, tone, _, future in batch:
+                    if not future.done():
+                        future.set_result(self._fallback_rewrite(text, tone))
+    
+    def _run_rewrite_batch(self, batch):
+        """Rewrite a batch of (text, tone, cache_key, future) items with a single request"""
+        prompts = [self._build_rewrite_prompt(text, tone) for text, tone, _, _ in batch]
+        results = [None] * len(batch)
+        try:
+            response = self._make_request(self.text_model, self._rewrite_payload(prompts))
+            if response and response.status_code == 200:
+                result = response.json()
+                if isinstance(result, list) and len(result) == len(batch):
+                    results = result
+                else:
+                    logger.error(f"Unexpected batch response format: {result}")
+            else:
+                error_msg = response.text if response else "No response"
+                logger.error(f"Hugging Face batch text generation failed: {error_msg}")
+        except Exception as e:
+            logger.error(f"Error in batch text rewriting: {e}")
+        
+        for (text, tone, cache_key, future), full_prompt, item in zip(batch, prompts, results):
+            # Each input may come back as a list of generations or as a single one
+            if isinstance(item, list):
+                item = item[0] if item else None
+            generated_text = item.get('generated_text', '') if isinstance(item, dict) else ''
+            clean_text = generated_text.replace(full_prompt, '').strip()
+            if clean_text:
+                self.text_cache.put(cache_key, clean_text)
+                future.set_result(clean_text)
+            else:
+                future.set_result(self._fallback_rewrite(text, tone))
     
     def synthesize_speech(self, text: str, voice: str = "default", tone: str = "neutral") -> Optional[bytes]:
         """
         Generate high-quality speech from text using Hugging Face TTS models with tone support
         """
-        if not self.api_token:
-            logger.info("Using high-quality local TTS (no Hugging Face token)")
-            return self._create_mock_audio(text, voice, tone)
+        cache_key = None
+        if self.api_token:
+            cache_key = self._audio_cache_key(text, voice, tone)
+            cached = self.audio_cache.get(cache_key)
+            if cached is None:
+                # Survives restarts; promote disk hits into memory
+                cached = self._disk_get(cache_key)
+                if cached is not None:
+                    self.audio_cache.put(cache_key, cached)
+            if cached is not None:
+                return cached
         
+        # Cache hits above skip the queue; actual synthesis is limited to TTS_CONCURRENCY at a time
+        with self._tts_semaphore:
+            audio_data = self._synthesize_speech(text, voice, tone, cache_key)
+        return self._compact_wav(audio_data) if self.compact_wav else audio_data
+    
+    def _audio_cache_key(self, text: str, voice: str, tone: str) -> bytes:
+        """Cache key for synthesized audio; includes the output format so TTS_COMPACT_WAV changes miss"""
+        return hashlib.md5(f"{text}|{voice}|{tone}|{int(self.compact_wav)}".encode()).digest()
+    
+    def _disk_get(self, key: bytes) -> Optional[bytes]:
+        """Read cached audio for key from the disk cache, or None"""
+        if self.audio_cache_dir is None:
+            return None
+        path = self.audio_cache_dir / f"{key.hex()}.wav"
         try:
-            # Try multiple TTS models for best quality
-            for model in self.tts_models:
+            data = path.read_bytes()
+            # Refresh mtime so eviction drops the least recently used files first
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Error reading TTS disk cache: {e}")
+            return None
+    
+    def _disk_put(self, key: bytes, data: bytes):
+        """Write audio for key to the disk cache atomically"""
+        if self.audio_cache_dir is None:
+            return
+        try:
+            self.audio_cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.audio_cache_dir, suffix='.part')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                # Readers only ever see a missing or a complete file
+                os.replace(temp_path, self.audio_cache_dir / f"{key.hex()}.wav")
+            except BaseException:
+                with suppress(FileNotFoundError):
+                    os.unlink(temp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Error writing TTS disk cache: {e}")
+            return
+        
+        with self._disk_cache_lock:
+            if self._disk_cache_bytes is None:
+                self._disk_cache_bytes = sum(entry.stat().st_size for entry in self.audio_cache_dir.glob('*.wav'))
+            else:
+                self._disk_cache_bytes += len(data)
+            if self._disk_cache_bytes > self.disk_cache_max_bytes:
+                self._evict_disk_cache()
+    
+    def _evict_disk_cache(self):
+        """Delete the oldest cached files until the disk cache is back under 90% of its cap"""
+        try:
+            entries = []
+            for entry in self.audio_cache_dir.glob('*.wav'):
+                with suppress(FileNotFoundError):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry))
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            target = self.disk_cache_max_bytes * 0.9
+            for _, size, entry in entries:
+                if total <= target:
+                    break
+                with suppress(FileNotFoundError):
+                    entry.unlink()
+                total -= size
+            self._disk_cache_bytes = total
+        except OSError as e:
+            logger.warning(f"Error evicting TTS disk cache: {e}")
+    
+    def synthesize_speech_stream(self, text: str, voice: str = "default", tone: str = "neutral") -> Iterator[bytes]:
+        """
+        Yield synthesized speech in chunks as it arrives from Hugging Face, for Response(generator, mimetype='audio/wav')
+        """
+        cache_key = None
+        if self.api_token:
+            cache_key = self._audio_cache_key(text, voice, tone)
+            cached = self.audio_cache.get(cache_key)
+            if cached is None:
+                cached = self._disk_get(cache_key)
+            if cached is not None:
+                yield from self._iter_chunks(cached)
+                return
+        
+        # Streaming needs requests' stream=True; compaction needs the whole file; otherwise fall back to one shot
+        if self.api_token and isinstance(self.session, requests.Session) and not self.compact_wav:
+            with self._model_lock:
+                models = list(self.tts_models)
+            now = time.time()
+            for model in models:
+                if now < self._model_state.get(model, {}).get('cold_until', 0):
+                    continue
+                chunks = []
                 try:
-                    logger.info(f"Trying TTS model: {model}")
-                    
-                    # Enhanced payload for better quality
-                    payload = {
-                        "inputs": text,
-                        "options": {
-                            "use_cache": False,
-                            "wait_for_model": True
-                        }
-                    }
-                    
-                    # Use different endpoint for TTS models
-                    response = self._make_request(model, payload, timeout=90)
-                    
-                    if response and response.status_code == 200:
-                        # Check if response is audio data
+                    payload = {"inputs": text, "options": {"use_cache": self.use_server_cache, "wait_for_model": True}}
+                    # Synthesis happens before the headers arrive, so only the request counts against
+                    # TTS_CONCURRENCY; a slow reader of the body doesn't hold up other synths
+                    with self._tts_semaphore:
+                        response = self.session.post(f"{self.base_url}/{model}", data=_json_dumps(payload),
+                                                     stream=True, timeout=(self.connect_timeout, 90))
+                    with response:
                         content_type = response.headers.get('content-type', '')
-                        if 'audio' in content_type or len(response.content) > 1000:  # Audio files are typically large
-                            logger.info(f"High-quality TTS successful with {model}: {len(response.content)} bytes")
-                            return response.content
-                        else:
-                            # If it's JSON, the model might not be ready
-                            try:
-                                result = response.json()
-                                if 'error' in result:
-                                    logger.warning(f"TTS model {model} error: {result['error']}")
-                                elif 'estimated_time' in result:
-                                    logger.info(f"Model {model} loading, estimated time: {result['estimated_time']}s")
-                            except:
-                                pass
+                        if response.status_code != 200 or 'audio' not in content_type:
+                            logger.warning(f"TTS model {model} can't stream: {response.status_code} {content_type}")
+                            self._mark_model_cold(model, TTS_MODEL_COOLDOWN)
                             continue
-                    else:
-                        error_msg = response.text if response else "No response"
-                        logger.warning(f"TTS model {model} failed: {error_msg}")
-                        continue
-                        
+                        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                            chunks.append(chunk)
+                            yield chunk
                 except Exception as e:
-                    logger.warning(f"Error with TTS model {model}: {e}")
+                    logger.warning(f"Error streaming TTS model {model}: {e}")
+                    self._mark_model_cold(model, TTS_MODEL_COOLDOWN)
+                    if chunks:
+                        # Bytes already went out and a different model can't continue the same file;
+                        # raise so the caller discards the truncated audio
+                        raise
                     continue
+                
+                audio_data = b''.join(chunks)
+                self._model_state.setdefault(model, {'cold_until': 0, 'last_ok': 0})['last_ok'] = time.time()
+                self._promote_tts_model(model)
+                self.audio_cache.put(cache_key, audio_data)
+                self._disk_put(cache_key, audio_data)
+                return
+        
+        yield from self._iter_chunks(self.synthesize_speech(text, voice, tone))
+    
+    def synthesize_speech_to_file(self, text: str, path: str, voice: str = "default", tone: str = "neutral") -> int:
+        """
+        Write synthesized speech to path as it streams in; returns bytes written (no file is left when 0 or on error)
+        """
+        written = 0
+        try:
+            with open(path, 'wb') as f:
+                for chunk in self.synthesize_speech_stream(text, voice, tone):
+                    f.write(chunk)
+                    written += len(chunk)
+        except BaseException:
+            # A stream cut off mid-file would leave a truncated WAV that looks valid
+            with suppress(FileNotFoundError):
+                os.remove(path)
+            raise
+        if not written:
+            os.remove(path)
+        return written
+    
+    @staticmethod
+    def _iter_chunks(audio_data: Optional[bytes]) -> Iterator[bytes]:
+        """Split complete audio into STREAM_CHUNK_SIZE pieces"""
+        audio_data = audio_data or b""
+        for start in range(0, len(audio_data), STREAM_CHUNK_SIZE):
+            yield audio_data[start:start + STREAM_CHUNK_SIZE]
+    
+    def _compact_wav(self, audio_data: Optional[bytes]) -> Optional[bytes]:
+        """Resample 16-bit PCM WAV above COMPACT_WAV_RATE down to it; anything else is returned unchanged"""
+        if not audio_data or audioop is None:
+            return audio_data
+        try:
+            with wave.open(io.BytesIO(audio_data), 'rb') as wav_in:
+                channels, sample_width, rate = wav_in.getnchannels(), wav_in.getsampwidth(), wav_in.getframerate()
+                if sample_width != 2 or rate <= COMPACT_WAV_RATE:
+                    return audio_data
+                frames = wav_in.readframes(wav_in.getnframes())
+        except (wave.Error, EOFError):
+            # Not a PCM WAV (e.g. FLAC from a Hugging Face model)
+            return audio_data
+        
+        frames, _ = audioop.ratecv(frames, sample_width, channels, rate, COMPACT_WAV_RATE, None)
+        wav_buffer = io.BytesIO()
+        with wave.open(wav_buffer, 'wb') as wav_out:
+            wav_out.setnchannels(channels)
+            wav_out.setsampwidth(sample_width)
+            wav_out.setframerate(COMPACT_WAV_RATE)
+            wav_out.writeframes(frames)
+        return wav_buffer.getvalue()
+    
+    def _synthesize_speech(self, text: str, voice: str, tone: str, cache_key: Optional[bytes]) -> Optional[bytes]:
+        """Run speech synthesis on Hugging Face or locally, caching Hugging Face audio under cache_key"""
+        if not self.api_token:
+            logger.info("Using high-quality local TTS (no Hugging Face token)")
+            return self._create_mock_audio(text, voice, tone)
+        
+        try:
+            # Try multiple TTS models for best quality, last-known-good first
+            now = time.time()
+            with self._model_lock:
+                models = list(self.tts_models)
+            warm = [m for m in models if now >= self._model_state.get(m, {}).get('cold_until', 0)]
+            for model in models:
+                if model not in warm:
+                    # Still warming up or recently failed; don't pay for it again
+                    logger.info("Skipping cold TTS model: %s", model)
+            
+            # Race the top candidates, then fall back to the rest one at a time
+            race = warm[:self.tts_race_models] if self.tts_race_models > 1 else []
+            winner, audio_data = self._race_tts_models(race, text) if len(race) > 1 else (None, None)
+            if audio_data is None:
+                for model in warm[len(race):] if len(race) > 1 else warm:
+                    audio_data = self._try_tts_model(model, text)
+                    if audio_data:
+                        winner = model
+                        break
+            
+            if audio_data:
+                self._promote_tts_model(winner)
+                self.audio_cache.put(cache_key, audio_data)
+                self._disk_put(cache_key, audio_data)
+                return audio_data
             
             # If all Hugging Face models fail, use high-quality local TTS
             logger.info("All Hugging Face TTS models failed, using high-quality local TTS")
@@ -201,187 +721,184 @@ class HuggingFaceService:
             logger.info("Using high-quality local TTS fallback")
             return self._create_mock_audio(text, voice, tone)
     
-    def _create_mock_audio(self, text: str = None, voice: str = "default", tone: str = "neutral") -> bytes:
-        """
-        Create high-quality speech audio using pyttsx3 with tone and voice variations
-        """
+    def _race_tts_models(self, models, text: str):
+        """Ask several TTS models at once and return (model, audio) from the first to succeed, or (None, None)"""
+        if self._race_executor is None:
+            with self._model_lock:
+                if self._race_executor is None:
+                    # Losing requests run on after synthesize_speech releases _tts_semaphore; sizing the pool
+                    # from TTS_CONCURRENCY keeps them counted against the limit (new races queue behind them)
+                    self._race_executor = ThreadPoolExecutor(max_workers=self._tts_concurrency * self.tts_race_models,
+                                                             thread_name_prefix='hf-tts-race')
+        futures = {self._race_executor.submit(self._try_tts_model, model, text): model for model in models}
+        for future in as_completed(futures):
+            try:
+                audio_data = future.result()
+            except Exception:
+                continue
+            if audio_data:
+                # Slower requests can't be aborted mid-flight; they finish in the background and are ignored
+                return futures[future], audio_data
+        return None, None
+    
+    def _try_tts_model(self, model: str, text: str) -> Optional[bytes]:
+        """Synthesize text with one Hugging Face TTS model, updating its circuit-breaker state; None on failure"""
         try:
-            import pyttsx3
-            import tempfile
-            import os
-            
-            # Initialize the TTS engine with high-quality settings
-            engine = pyttsx3.init(driverName='sapi5')  # Use SAPI5 for Windows for better quality
+            logger.info("Trying TTS model: %s", model)
             
-            # Enhanced tone-specific speech parameters for better audio quality
-            tone_settings = {
-                'neutral': {'rate': 160, 'volume': 0.9, 'pitch': 0},
-                'cheerful': {'rate': 180, 'volume': 0.95, 'pitch': 5},
-                'confident': {'rate': 150, 'volume': 0.95, 'pitch': 0},
-                'suspenseful': {'rate': 130, 'volume': 0.8, 'pitch': -5},
-                'inspiring': {'rate': 170, 'volume': 0.95, 'pitch': 3},
-                'sad': {'rate': 120, 'volume': 0.7, 'pitch': -8},
-                'angry': {'rate': 190, 'volume': 1.0, 'pitch': 2},
-                'playful': {'rate': 185, 'volume': 0.9, 'pitch': 7},
-                'calm': {'rate': 140, 'volume': 0.8, 'pitch': -2},
-                'professional': {'rate': 155, 'volume': 0.9, 'pitch': 0},
-                'dramatic': {'rate': 135, 'volume': 0.85, 'pitch': -3}
+            # Enhanced payload for better quality
+            payload = {
+                "inputs": text,
+                "options": {
+                    "use_cache": self.use_server_cache,
+                    "wait_for_model": True
+                }
             }
             
-            # Get tone settings or use neutral as default
-            settings = tone_settings.get(tone.lower(), tone_settings['neutral'])
-            
-            # Set high-quality properties based on tone
-            engine.setProperty('rate', settings['rate'])     # Optimized speech rate
-            engine.setProperty('volume', settings['volume']) # Optimized volume
+            # Use different endpoint for TTS models
+            response = self._make_request(model, payload, timeout=90)
             
-            # Get available voices and try to match with voice parameter
-            voices = engine.getProperty('voices')
-            if voices:
-                voice_selected = False
-                
-                # Enhanced voice mapping for all available Windows voices
-                voice_preferences = {
-                    'david': {
-                        'keywords': ['david', 'male', 'man'],
-                        'gender': 'male',
-                        'index': 0  # David is typically at index 0
-                    },
-                    'zira': {
-                        'keywords': ['zira', 'female', 'woman'],
-                        'gender': 'female',
-                        'index': 1  # Zira is typically at index 1
-                    },
-                    'heera': {
-                        'keywords': ['heera', 'female', 'woman'],
-                        'gender': 'female',
-                        'index': 2  # Heera may be at index 2
-                    },
-                    'mark': {
-                        'keywords': ['mark', 'male', 'man'],
-                        'gender': 'male',
-                        'index': 3  # Mark may be at index 3
-                    },
-                    'ravi': {
-                        'keywords': ['ravi', 'male', 'man'],
-                        'gender': 'male',
-                        'index': 4  # Ravi may be at index 4
-                    },
-                    # Legacy mappings for backward compatibility
-                    'lisa': {
-                        'keywords': ['zira', 'female', 'woman', 'lisa'],
-                        'gender': 'female',
-                        'index': 1  # Maps to Zira
-                    },
-                    'michael': {
-                        'keywords': ['david', 'male', 'man', 'michael'],
-                        'gender': 'male',
-                        'index': 0  # Maps to David
-                    },
-                    'allison': {
-                        'keywords': ['heera', 'female', 'woman', 'allison'],
-                        'gender': 'female', 
-                        'index': 2  # Maps to Heera
-                    }
-                }
-                
-                preferred_voice = voice_preferences.get(voice.lower())
-                
-                if preferred_voice and len(voices) > preferred_voice['index']:
-                    # Use the specific index for reliable voice selection
-                    selected_voice = voices[preferred_voice['index']]
-                    engine.setProperty('voice', selected_voice.id)
-                    voice_selected = True
-                    logger.info(f"Selected voice by index {preferred_voice['index']}: {selected_voice.name} for {voice}")
-                else:
-                    # Fallback to keyword matching if index is out of range
-                    if preferred_voice:
-                        # First, try to find voices with specific keywords
-                        for voice_obj in voices:
-                            voice_name = voice_obj.name.lower()
-                            voice_id = voice_obj.id.lower()
-                            
-                            # Check if voice name/id contains any of the preferred keywords
-                            for keyword in preferred_voice['keywords']:
-                                if keyword in voice_name or keyword in voice_id:
-                                    engine.setProperty('voice', voice_obj.id)
-                                    voice_selected = True
-                                    logger.info(f"Selected voice by keyword '{keyword}': {voice_obj.name} for {voice}")
-                                    break
-                            if voice_selected:
-                                break
-                        
-                        # If no keyword match, try to match by gender
-                        if not voice_selected:
-                            target_gender = preferred_voice['gender']
-                            for voice_obj in voices:
-                                voice_name = voice_obj.name.lower()
-                                voice_id = voice_obj.id.lower()
-                                
-                                # Check for gender indicators and specific voice names
-                                if target_gender == 'female' and any(indicator in voice_name or indicator in voice_id 
-                                                                   for indicator in ['female', 'woman', 'zira', 'heera']):
-                                    engine.setProperty('voice', voice_obj.id)
-                                    voice_selected = True
-                                    logger.info(f"Selected voice by gender '{target_gender}': {voice_obj.name} for {voice}")
-                                    break
-                                elif target_gender == 'male' and any(indicator in voice_name or indicator in voice_id 
-                                                                   for indicator in ['male', 'man', 'david', 'mark', 'ravi']):
-                                    engine.setProperty('voice', voice_obj.id)
-                                    voice_selected = True
-                                    logger.info(f"Selected voice by gender '{target_gender}': {voice_obj.name} for {voice}")
-                                    break
-                
-                # If still no voice selected, cycle through available voices based on voice parameter
-                if not voice_selected and voices:
-                    # Use different voices for different selections
-                    voice_index_map = {
-                        'lisa': 0,
-                        'michael': min(1, len(voices) - 1),
-                        'allison': min(2, len(voices) - 1) if len(voices) > 2 else 0
-                    }
-                    
-                    voice_index = voice_index_map.get(voice.lower(), 0)
-                    selected_voice = voices[voice_index]
-                    engine.setProperty('voice', selected_voice.id)
-                    voice_selected = True
-                    logger.info(f"Selected voice by index {voice_index}: {selected_voice.name} for {voice}")
-                
-                # Log available voices for debugging
-                logger.info(f"Available voices on system:")
-                for i, v in enumerate(voices):
-                    logger.info(f"  {i}: {v.name} (ID: {v.id})")
-                
-                if not voice_selected:
-                    # Fallback to first available voice
-                    engine.setProperty('voice', voices[0].id)
-                    logger.info(f"Using fallback voice: {voices[0].name}")
+            if response and response.status_code == 200:
+                # Check if response is audio data
+                content_type = response.headers.get('content-type', '')
+                if 'audio' in content_type or len(response.content) > 1000:  # Audio files are typically large
+                    logger.info("High-quality TTS successful with %s: %d bytes", model, len(response.content))
+                    self._model_state.setdefault(model, {'cold_until': 0, 'last_ok': 0})['last_ok'] = time.time()
+                    return self._compact_wav(response.content) if self.compact_wav else response.content
             
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-                temp_path = temp_file.name
+            if response is None:
+                logger.warning(f"TTS model {model} failed: No response")
+                self._mark_model_cold(model, TTS_MODEL_COOLDOWN)
+                return None
             
-            # Generate speech and save to temporary file
-            engine.save_to_file(text or "Hello, this is a test message.", temp_path)
-            engine.runAndWait()
+            # If it's JSON, the model might not be ready
+            try:
+                result = response.json()
+            except ValueError:
+                result = {}
+            if isinstance(result, dict) and 'estimated_time' in result:
+                logger.info("Model %s loading, estimated time: %ss", model, result['estimated_time'])
+                self._mark_model_cold(model, float(result['estimated_time']) + 2)
+            else:
+                error_msg = result.get('error') if isinstance(result, dict) and 'error' in result else response.text
+                logger.warning(f"TTS model {model} failed: {error_msg}")
+                self._mark_model_cold(model, TTS_MODEL_COOLDOWN)
+            return None
+                
+        except Exception as e:
+            logger.warning(f"Error with TTS model {model}: {e}")
+            self._mark_model_cold(model, TTS_MODEL_COOLDOWN)
+            return None
+    
+    def _promote_tts_model(self, model: str):
+        """Move the model that just worked to the front of tts_models for the next call"""
+        with self._model_lock:
+            if model in self.tts_models:
+                self.tts_models.remove(model)
+            self.tts_models.insert(0, model)
+    
+    def _mark_model_cold(self, model: str, seconds: float):
+        """Skip model in synthesize_speech for the next seconds"""
+        self._model_state.setdefault(model, {'cold_until': 0, 'last_ok': 0})['cold_until'] = time.time() + seconds
+    
+    def _ensure_engine(self):
+        """Initialize the process-wide pyttsx3 engine on first use"""
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    import pyttsx3
+                    # Initialize the TTS engine with high-quality settings
+                    engine = pyttsx3.init(driverName='sapi5')  # Use SAPI5 for Windows for better quality
+                    self._voices = engine.getProperty('voices')
+                    # Log available voices for debugging, once per process rather than per synth
+                    logger.info("Available voices on system:")
+                    for i, v in enumerate(self._voices or []):
+                        logger.info("  %d: %s (ID: %s)", i, v.name, v.id)
+                    self._build_voice_map(self._voices)
+                    self._engine = engine
+        return self._engine
+    
+    def _build_voice_map(self, voices):
+        """Resolve every known voice name to an installed voice id in one pass over voices"""
+        self._voice_id_by_name = {}
+        self._voice_id_by_gender = {}
+        if not voices:
+            return
+        
+        # First installed voice matching each gender's indicators
+        gender_indicators = {
+            'female': ['female', 'woman', 'zira', 'heera'],
+            'male': ['male', 'man', 'david', 'mark', 'ravi']
+        }
+        for voice_obj in voices:
+            voice_text = f"{voice_obj.name.lower()} {voice_obj.id.lower()}"
+            for gender, indicators in gender_indicators.items():
+                if gender not in self._voice_id_by_gender and any(indicator in voice_text for indicator in indicators):
+                    self._voice_id_by_gender[gender] = voice_obj.id
+        
+        # Index-based fallback used when neither keywords nor gender match
+        voice_index_map = {
+            'lisa': 0,
+            'michael': min(1, len(voices) - 1),
+            'allison': min(2, len(voices) - 1) if len(voices) > 2 else 0
+        }
+        
+        for name, preferred_voice in _VOICE_PREFERENCES.items():
+            if len(voices) > preferred_voice['index']:
+                # Use the specific index for reliable voice selection
+                self._voice_id_by_name[name] = voices[preferred_voice['index']].id
+                continue
+            # Fallback to keyword matching if index is out of range
+            voice_id = next((voice_obj.id for voice_obj in voices
+                             if any(keyword in voice_obj.name.lower() or keyword in voice_obj.id.lower()
+                                    for keyword in preferred_voice['keywords'])), None)
+            # If no keyword match, try to match by gender
+            voice_id = voice_id or self._voice_id_by_gender.get(preferred_voice['gender'])
+            self._voice_id_by_name[name] = voice_id or voices[voice_index_map.get(name, 0)].id
+        
+        for name, voice_id in self._voice_id_by_name.items():
+            logger.info(f"Voice '{name}' mapped to {voice_id}")
+    
+    def _create_mock_audio(self, text: str = None, voice: str = "default", tone: str = "neutral") -> bytes:
+        """
+        Create high-quality speech audio using pyttsx3 with tone and voice variations
+        """
+        try:
+            engine = self._ensure_engine()
             
-            # Read the generated audio file
+            # pyttsx3 drivers can only write to a path; use RAM-backed /dev/shm where the OS has it
+            fd, temp_path = tempfile.mkstemp(suffix='.wav', dir=_TTS_TEMP_DIR)
+            os.close(fd)
             try:
+                # SAPI5 is not thread-safe: configure and run the shared engine one call at a time
+                with self._engine_lock:
+                    # Get tone settings or use neutral as default
+                    settings = _TONE_SETTINGS.get(tone.lower(), _TONE_SETTINGS['neutral'])
+                    
+                    # Set high-quality properties based on tone
+                    engine.setProperty('rate', settings['rate'])     # Optimized speech rate
+                    engine.setProperty('volume', settings['volume']) # Optimized volume
+                    
+                    # Select the voice from the map built once at engine start-up
+                    voices = self._voices
+                    if voices:
+                        voice_id = self._voice_id_by_name.get(voice.lower(), voices[0].id)
+                        engine.setProperty('voice', voice_id)
+                    
+                    # Generate speech and save to temporary file
+                    engine.save_to_file(text or "Hello, this is a test message.", temp_path)
+                    engine.runAndWait()
+                
+                # Read the generated audio file
                 with open(temp_path, 'rb') as f:
                     audio_data = f.read()
-                
-                # Clean up temporary file
-                os.unlink(temp_path)
-                
-                logger.info(f"Generated {len(audio_data)} bytes of audio with voice: {voice}, tone: {tone}")
-                return audio_data
-                
-            except Exception as e:
-                logger.error(f"Error reading generated audio file: {e}")
-                # Clean up on error
-                if os.path.exists(temp_path):
+            finally:
+                # Clean up temporary file, including when synthesis failed
+                with suppress(FileNotFoundError):
                     os.unlink(temp_path)
-                return b""  # Return empty bytes on error
+            
+            logger.info("Generated %d bytes of audio with voice: %s, tone: %s", len(audio_data), voice, tone)
+            return audio_data
                 
         except ImportError:
             logger.error("pyttsx3 not available, cannot generate speech")
@@ -389,16 +906,11 @@ class HuggingFaceService:
         except Exception as e:
             logger.error(f"Error in mock TTS generation: {e}")
             return b""
-            return self._create_silence_wav()
     
     def _create_silence_wav(self) -> bytes:
         """
         Create a simple WAV file with silence as final fallback
         """
-        import wave
-        import struct
-        import io
-        
         # Create a simple 2-second silence WAV file
         sample_rate = 22050
         duration = 2  # seconds
@@ -411,27 +923,15 @@ class HuggingFaceService:
             wav_file.setsampwidth(2)  # 16-bit
             wav_file.setframerate(sample_rate)
             
-            # Write silence (zeros)
-            for _ in range(num_samples):
-                wav_file.writeframes(struct.pack('<h', 0))
+            # Write silence (zeros) as one 16-bit frame buffer
+            wav_file.writeframes(b'\x00\x00' * num_samples)
         
         wav_buffer.seek(0)
         return wav_buffer.getvalue()
     
     def get_available_models(self) -> Dict[str, list]:
         """Get list of available models (for information)"""
-        return {
-            "text_models": [
-                "ibm-granite/granite-3.3-8b-instruct",
-                "ibm-granite/granite-speech-3.3-8b", 
-                "ibm-granite/granite-speech-3.3-2b"
-            ],
-            "tts_models": [
-                "microsoft/speecht5_tts",
-                "facebook/fastspeech2-en-ljspeech",
-                "espnet/kan-bayashi_ljspeech_vits"
-            ]
-        }
+        return {kind: list(models) for kind, models in _AVAILABLE_MODELS.items()}
     
     def test_connection(self) -> Dict[str, bool]:
         """Test connection to Hugging Face services"""
@@ -444,20 +944,41 @@ class HuggingFaceService:
         if not self.api_token:
             return results
         
+        # Run the probes concurrently; a dead endpoint costs HEALTH_CHECK_TIMEOUT, not the full request timeouts
+        executor = ThreadPoolExecutor(max_workers=3)
+        f_auth = executor.submit(self.session.get, "https://huggingface.co/api/whoami-v2", timeout=HEALTH_CHECK_TIMEOUT)
+        # Probe the endpoints directly; rewrite_text/synthesize_speech may answer from the text/audio caches
+        f_text = executor.submit(self._make_request, self.text_model,
+                                 self._rewrite_payload(self._build_rewrite_prompt("Hello, this is a test.", "neutral")),
+                                 HEALTH_CHECK_TIMEOUT)
+        # One model, bounded, without wait_for_model and outside _tts_semaphore, so a health check
+        # never queues behind (or blocks) user synthesis
+        f_tts = executor.submit(self._make_request, self.tts_models[0],
+                                {"inputs": "Test", "options": {"use_cache": self.use_server_cache}},
+                                HEALTH_CHECK_TIMEOUT)
+        
+        # Check the token itself
+        try:
+            results["api_token_valid"] = f_auth.result(timeout=HEALTH_CHECK_TIMEOUT).status_code == 200
+        except Exception:
+            pass
+        
         # Test text generation
         try:
-            test_response = self.rewrite_text("Hello, this is a test.", "neutral")
-            results["text_generation"] = bool(test_response and test_response != "Hello, this is a test.")
-        except:
+            test_response = f_text.result(timeout=HEALTH_CHECK_TIMEOUT)
+            results["text_generation"] = bool(test_response is not None and test_response.status_code == 200)
+        except Exception:
             pass
         
         # Test TTS
         try:
-            test_audio = self.synthesize_speech("Test", "default", "neutral")
-            results["text_to_speech"] = bool(test_audio)
-        except:
+            test_audio = f_tts.result(timeout=HEALTH_CHECK_TIMEOUT)
+            results["text_to_speech"] = bool(test_audio is not None and test_audio.status_code == 200)
+        except Exception:
             pass
         
+        # Don't wait for probes that timed out; each is capped by its own request timeout
+        executor.shutdown(wait=False, cancel_futures=True)
         return results
 
 # Global instance
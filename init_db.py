@@ -8,7 +8,7 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database_manager import db_manager
+from database_manager_sqlite import db_manager
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -88,15 +88,8 @@ def initialize_database():
                 }
             ]
             
-            for history in sample_histories:
-                db_manager.create_audio_history(
-                    user_id=user_id,
-                    original_text=history['original_text'],
-                    rewritten_text=history['rewritten_text'],
-                    tone=history['tone'],
-                    voice=history['voice'],
-                    audio_generated=history['audio_generated']
-                )
+            # One transaction and one INSERT for all sample rows
+            db_manager.create_audio_histories_bulk(user_id, sample_histories)
             
             logger.info("Sample audio history created")
         else:
@@ -5,7 +5,8 @@ This script creates the database and initializes it with sample data.
 
 import os
 import sys
-import pymysql
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Add the backend directory to Python path
@@ -16,6 +17,9 @@ from database_manager import DatabaseManager
 # Load environment variables
 load_dotenv()
 
+# Concurrent connections used to seed the sample user's child tables
+SEED_WORKERS = 4
+
 def init_mysql_database():
     """Initialize MySQL database with schema and sample data"""
     print("Initializing MySQL database for EchoVerse...")
@@ -28,14 +32,18 @@ def init_mysql_database():
         print("Creating database and tables...")
         db_manager.ensure_database_exists()
         
+        # Prime the tones/voices cache in the background while the sample data is seeded
+        threading.Thread(target=db_manager.warm_reference_cache, daemon=True).start()
+        
         # Test connection
         print("Testing database connection...")
-        if not db_manager.test_connection():
+        # ensure_database_exists just talked to the server; skip the extra round-trip
+        if not db_manager.test_connection(skip_if_recent=30):
             raise Exception("Database connection test failed")
         
         print("✅ Database connection successful!")
         
-        # Create a sample user
+        # Create the sample user first; it must be committed before other connections reference it
         print("Creating sample user...")
         user_id = db_manager.create_user(
             name="John Doe",
@@ -53,29 +61,18 @@ def init_mysql_database():
         if user_id:
             print(f"✅ Sample user created with ID: {user_id}")
             
-            # Add sample skills
+            # Sample skills and interests
             skills = ["Python", "JavaScript", "React", "Machine Learning", "Data Analysis"]
-            for skill in skills:
-                db_manager.add_user_skill(user_id, skill)
-            print("✅ Sample skills added")
-            
-            # Add sample interests
             interests = ["Artificial Intelligence", "Web Development", "Data Science", "Robotics"]
-            for interest in interests:
-                db_manager.add_user_interest(user_id, interest)
-            print("✅ Sample interests added")
             
-            # Add sample achievements
+            # Sample achievements
             achievements = [
                 ("Dean's List - Fall 2023", "2023-12-15"),
                 ("Hackathon Winner - Tech Fest 2023", "2023-11-20"),
                 ("Research Paper Published", "2023-10-10")
             ]
-            for achievement_text, date in achievements:
-                db_manager.add_user_achievement(user_id, achievement_text, date)
-            print("✅ Sample achievements added")
             
-            # Add sample projects
+            # Sample projects
             projects = [
                 {
                     "project_name": "EchoVerse AI Audiobook",
@@ -90,28 +87,44 @@ def init_mysql_database():
                     "project_url": "https://github.com/johndoe/weather-ml"
                 }
             ]
-            for project in projects:
-                db_manager.add_user_project(user_id, **project)
-            print("✅ Sample projects added")
             
-            # Add sample audio history
-            history_id = db_manager.save_audio_history(
-                user_id=user_id,
-                original_text="Hello, this is a test of the EchoVerse system.",
-                rewritten_text="Welcome! This is an exciting demonstration of the EchoVerse platform.",
-                tone="inspiring",
-                voice="lisa",
-                audio_file_path="/audio/sample_audio_001.wav"
-            )
-            if history_id:
-                db_manager.update_audio_history_status(history_id, "completed")
-            print("✅ Sample audio history added")
+            def seed_audio_history():
+                # Sample audio history, saved and completed in one transaction
+                with db_manager.seed_session() as cursor:
+                    history_id = db_manager.save_audio_history(
+                        user_id=user_id,
+                        original_text="Hello, this is a test of the EchoVerse system.",
+                        rewritten_text="Welcome! This is an exciting demonstration of the EchoVerse platform.",
+                        tone="inspiring",
+                        voice="lisa",
+                        audio_file_path="/audio/sample_audio_001.wav",
+                        cursor=cursor
+                    )
+                    db_manager.update_audio_history_status(history_id, "completed", cursor=cursor)
+                return history_id
+            
+            # The child tables are independent once the user exists; seed them concurrently on pooled connections
+            seed_steps = {
+                "skills": lambda: db_manager.add_user_skills_bulk(user_id, skills),
+                "interests": lambda: db_manager.add_user_interests_bulk(user_id, interests),
+                "achievements": lambda: db_manager.add_user_achievements_bulk(user_id, achievements),
+                "projects": lambda: db_manager.add_user_projects_bulk(user_id, projects),
+                "audio history": seed_audio_history
+            }
+            with ThreadPoolExecutor(max_workers=SEED_WORKERS) as executor:
+                futures = {executor.submit(step): name for name, step in seed_steps.items()}
+                for future in as_completed(futures):
+                    # Bulk helpers return 0 on failure; the audio history session raises and rolls back
+                    if future.result():
+                        print(f"✅ Sample {futures[future]} added")
+                    else:
+                        print(f"❌ Failed to add sample {futures[future]}")
         
         # Get and display database statistics
-        print("\n📊 Database Statistics:")
         stats = db_manager.get_database_stats()
-        for key, value in stats.items():
-            print(f"  {key}: {value}")
+        lines = ["\n📊 Database Statistics:"]
+        lines.extend(f"  {key}: {value}" for key, value in stats.items())
+        print("\n".join(lines))
         
         print("\n🎉 MySQL database initialization completed successfully!")
         print(f"Database: {os.getenv('DB_DATABASE')}")
@@ -3,13 +3,33 @@
 Database migration script to add authentication fields to existing users table
 """
 
-import pymysql
+try:
+    # mysqlclient (libmysqlclient C extension) exposes a pymysql-compatible API
+    import MySQLdb as pymysql
+    import MySQLdb.cursors
+except ImportError:
+    import pymysql
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Marker row written to schema_migrations once this migration has run
+MIGRATION_NAME = 'auth_fields_v1'
+
+# Authentication columns added to users: (name, column definition)
+AUTH_COLUMNS = [
+    ('password_hash', "VARCHAR(255) NOT NULL DEFAULT ''"),
+    ('is_verified', 'BOOLEAN DEFAULT FALSE'),
+    ('last_login', 'TIMESTAMP NULL'),
+]
+
+# Server errors meaning ALGORITHM=INSTANT can't be used: ER_UNKNOWN_ALTER_ALGORITHM (MySQL 5.6/5.7,
+# 8.0.0-8.0.11, MariaDB < 10.3), a syntax error, ER_ALTER_OPERATION_NOT_SUPPORTED and
+# ER_ALTER_OPERATION_NOT_SUPPORTED_REASON
+INSTANT_UNSUPPORTED_ERRORS = (1800, 1064, 1845, 1846)
+
 def migrate_database():
     """Add authentication fields to existing users table"""
     try:
@@ -28,66 +48,50 @@ def migrate_database():
         
         with pymysql.connect(**db_config) as conn:
             with conn.cursor() as cursor:
-                # Check if password_hash column exists
+                # Applied migrations are recorded here so re-runs skip the information_schema probe
                 cursor.execute("""
-                    SELECT COUNT(*) as count 
-                    FROM information_schema.COLUMNS 
-                    WHERE TABLE_SCHEMA = %s 
-                    AND TABLE_NAME = 'users' 
-                    AND COLUMN_NAME = 'password_hash'
-                """, (db_config['database'],))
-                
-                result = cursor.fetchone()
-                
-                if result['count'] == 0:
-                    print("➕ Adding password_hash column...")
-                    cursor.execute("""
-                        ALTER TABLE users 
-                        ADD COLUMN password_hash VARCHAR(255) NOT NULL DEFAULT ''
-                    """)
-                else:
-                    print("✅ password_hash column already exists")
+                    CREATE TABLE IF NOT EXISTS schema_migrations (
+                        name VARCHAR(64) PRIMARY KEY,
+                        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                cursor.execute("SELECT 1 FROM schema_migrations WHERE name = %s", (MIGRATION_NAME,))
+                if cursor.fetchone():
+                    print(f"✅ Migration {MIGRATION_NAME} already applied")
+                    return True
                 
-                # Check if is_verified column exists
-                cursor.execute("""
-                    SELECT COUNT(*) as count 
+                # Check which authentication columns already exist, in one round-trip
+                cursor.execute(f"""
+                    SELECT COLUMN_NAME AS column_name
                     FROM information_schema.COLUMNS 
                     WHERE TABLE_SCHEMA = %s 
                     AND TABLE_NAME = 'users' 
-                    AND COLUMN_NAME = 'is_verified'
-                """, (db_config['database'],))
-                
-                result = cursor.fetchone()
+                    AND COLUMN_NAME IN ({', '.join(['%s'] * len(AUTH_COLUMNS))})
+                """, (db_config['database'], *(column for column, _ in AUTH_COLUMNS)))
                 
-                if result['count'] == 0:
-                    print("➕ Adding is_verified column...")
-                    cursor.execute("""
-                        ALTER TABLE users 
-                        ADD COLUMN is_verified BOOLEAN DEFAULT FALSE
-                    """)
-                else:
-                    print("✅ is_verified column already exists")
-                
-                # Check if last_login column exists
-                cursor.execute("""
-                    SELECT COUNT(*) as count 
-                    FROM information_schema.COLUMNS 
-                    WHERE TABLE_SCHEMA = %s 
-                    AND TABLE_NAME = 'users' 
-                    AND COLUMN_NAME = 'last_login'
-                """, (db_config['database'],))
+                existing = {row['column_name'] for row in cursor.fetchall()}
                 
-                result = cursor.fetchone()
+                clauses = []
+                for column, definition in AUTH_COLUMNS:
+                    if column not in existing:
+                        print(f"➕ Adding {column} column...")
+                        clauses.append(f"ADD COLUMN {column} {definition}")
+                    else:
+                        print(f"✅ {column} column already exists")
                 
-                if result['count'] == 0:
-                    print("➕ Adding last_login column...")
-                    cursor.execute("""
-                        ALTER TABLE users 
-                        ADD COLUMN last_login TIMESTAMP NULL
-                    """)
-                else:
-                    print("✅ last_login column already exists")
+                # One ALTER so the server rebuilds/locks the table at most once
+                if clauses:
+                    alter = "ALTER TABLE users " + ", ".join(clauses)
+                    try:
+                        # MySQL 8.0.12+ adds the columns as a metadata-only change
+                        cursor.execute(alter + ", ALGORITHM=INSTANT")
+                    except pymysql.MySQLError as e:
+                        if e.args[0] not in INSTANT_UNSUPPORTED_ERRORS:
+                            raise
+                        print("ℹ️  Instant ALTER not supported, falling back to a table rebuild")
+                        cursor.execute(alter)
                 
+                cursor.execute("INSERT IGNORE INTO schema_migrations (name) VALUES (%s)", (MIGRATION_NAME,))
                 conn.commit()
                 print("✅ Database migration completed successfully!")
                 
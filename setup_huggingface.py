@@ -2,10 +2,25 @@
 """
 Interactive Hugging Face Setup for EchoVerse
 This script helps you configure Hugging Face API credentials
+
+Pass --token (and optionally --text-model, --tts-model, --test/--no-test)
+to run it non-interactively, e.g. from CI.
 """
 
-import os
-import re
+import argparse
+from env_utils import update_env
+
+TEXT_MODELS = [
+    "ibm-granite/granite-3.3-8b-instruct",
+    "ibm-granite/granite-speech-3.3-8b", 
+    "ibm-granite/granite-speech-3.3-2b"
+]
+
+TTS_MODELS = [
+    "microsoft/speecht5_tts",
+    "facebook/fastspeech2-en-ljspeech", 
+    "espnet/kan-bayashi_ljspeech_vits"
+]
 
 def print_header():
     """Print setup header"""
@@ -14,6 +29,16 @@ def print_header():
     print("=" * 60)
     print()
 
+def validate_token(token):
+    """Return an error message for a malformed token, or None if it looks valid"""
+    if not token:
+        return "Token is required."
+    if not token.startswith('hf_'):
+        return "Invalid token format. Token should start with 'hf_'"
+    if len(token) < 20:
+        return "Token seems too short."
+    return None
+
 def get_huggingface_token():
     """Get Hugging Face API token from user"""
     print("📍 Step 1: Get Your Hugging Face API Token")
@@ -29,16 +54,9 @@ def get_huggingface_token():
     while True:
         token = input("Enter your Hugging Face API token: ").strip()
         
-        if not token:
-            print("❌ Token is required. Please try again.")
-            continue
-            
-        if not token.startswith('hf_'):
-            print("❌ Invalid token format. Token should start with 'hf_'")
-            continue
-            
-        if len(token) < 20:
-            print("❌ Token seems too short. Please check and try again.")
+        error = validate_token(token)
+        if error:
+            print(f"❌ {error} Please try again.")
             continue
             
         return token
@@ -49,11 +67,7 @@ def select_models():
     print("-" * 40)
     
     print("🤖 Text Generation Models (IBM Granite):")
-    text_models = [
-        "ibm-granite/granite-3.3-8b-instruct",
-        "ibm-granite/granite-speech-3.3-8b", 
-        "ibm-granite/granite-speech-3.3-2b"
-    ]
+    text_models = TEXT_MODELS
     
     for i, model in enumerate(text_models, 1):
         print(f"{i}. {model}")
@@ -69,11 +83,7 @@ def select_models():
     print(f"✅ Selected: {text_model}")
     
     print("\n🎵 Text-to-Speech Models:")
-    tts_models = [
-        "microsoft/speecht5_tts",
-        "facebook/fastspeech2-en-ljspeech", 
-        "espnet/kan-bayashi_ljspeech_vits"
-    ]
+    tts_models = TTS_MODELS
     
     for i, model in enumerate(tts_models, 1):
         print(f"{i}. {model}")
@@ -92,14 +102,6 @@ def select_models():
 
 def update_env_file(token, text_model, tts_model):
     """Update .env file with Hugging Face configuration"""
-    env_path = '.env'
-    
-    # Read current .env file
-    env_lines = []
-    if os.path.exists(env_path):
-        with open(env_path, 'r') as f:
-            env_lines = f.readlines()
-    
     # Configuration to update
     hf_config = {
         'HUGGINGFACE_API_TOKEN': token,
@@ -107,49 +109,56 @@ def update_env_file(token, text_model, tts_model):
         'HUGGINGFACE_TTS_MODEL': tts_model
     }
     
-    # Update or add Hugging Face configuration
-    updated_lines = []
-    keys_found = set()
-    
-    for line in env_lines:
-        line = line.strip()
-        if '=' in line and not line.startswith('#'):
-            key = line.split('=')[0].strip()
-            if key in hf_config:
-                updated_lines.append(f"{key}={hf_config[key]}\n")
-                keys_found.add(key)
-            else:
-                updated_lines.append(line + '\n')
-        else:
-            updated_lines.append(line + '\n')
-    
-    # Add any missing Hugging Face keys
-    for key, value in hf_config.items():
-        if key not in keys_found:
-            updated_lines.append(f"{key}={value}\n")
-    
-    # Write updated .env file
-    with open(env_path, 'w') as f:
-        f.writelines(updated_lines)
+    update_env(hf_config)
 
-def test_setup():
-    """Offer to test the setup"""
+def test_setup(test_now=None):
+    """Offer to test the setup; test_now skips the prompt when given"""
     print("\n📍 Step 3: Test Your Setup")
     print("-" * 40)
     
-    test_now = input("Would you like to test your Hugging Face setup now? (y/n): ").lower().startswith('y')
+    if test_now is None:
+        test_now = input("Would you like to test your Hugging Face setup now? (y/n): ").lower().startswith('y')
     
     if test_now:
         print("\n🧪 Running Hugging Face tests...")
-        os.system('python test_huggingface_setup.py')
+        try:
+            import test_huggingface_setup
+            test_huggingface_setup.main()
+        except Exception as e:
+            print(f"\n❌ Test failed with error: {str(e)}")
     else:
         print("\n💡 You can test your setup later by running:")
         print("   python test_huggingface_setup.py")
 
+def parse_args():
+    """Parse command line flags for non-interactive setup"""
+    parser = argparse.ArgumentParser(description="Configure Hugging Face API credentials for EchoVerse")
+    parser.add_argument('--token', help="Hugging Face API token; skips all prompts when given")
+    parser.add_argument('--text-model', default=TEXT_MODELS[0], help="Text generation model")
+    parser.add_argument('--tts-model', default=TTS_MODELS[0], help="Text-to-speech model")
+    parser.add_argument('--test', action=argparse.BooleanOptionalAction, default=None,
+                        help="Run (or skip) the setup test without asking")
+    args = parser.parse_args()
+    
+    if args.token is not None:
+        error = validate_token(args.token.strip())
+        if error:
+            parser.error(f"--token: {error}")
+    return args
+
 def main():
     """Main setup function"""
+    args = parse_args()
     print_header()
     
+    if args.token is not None:
+        # Non-interactive run: everything comes from the command line
+        print("💾 Updating configuration...")
+        update_env_file(args.token.strip(), args.text_model, args.tts_model)
+        print("✅ Configuration saved to .env file")
+        test_setup(bool(args.test))
+        return
+    
     print("This script will configure Hugging Face APIs for EchoVerse.")
     print("You'll get access to:")
     print("✨ IBM Granite models for intelligent text rewriting")
@@ -175,7 +184,7 @@ def main():
         print("✅ Configuration saved to .env file")
         
         # Test setup
-        test_setup()
+        test_setup(args.test)
         
         print("\n🎉 Hugging Face Setup Complete!")
         print("=" * 60)
@@ -2,11 +2,20 @@
 """
 Interactive IBM Watson Credentials Setup for EchoVerse
 This script helps you configure your IBM Watson API credentials
+
+Pass --tts-api-key, --watsonx-api-key and --watsonx-project-id (and optionally
+the URLs and --test/--no-test) to run it non-interactively, e.g. from CI.
 """
 
-import os
 import sys
 import re
+import argparse
+from env_utils import update_env
+
+DEFAULT_TTS_URL = "https://api.us-south.text-to-speech.watson.cloud.ibm.com"
+DEFAULT_WATSONX_URL = "https://us-south.ml.cloud.ibm.com"
+
+URL_PATTERN = re.compile(r'^https?://[^\s/$.?#].[^\s]*$')
 
 def print_header():
     """Print setup header"""
@@ -28,8 +37,7 @@ def validate_api_key(api_key):
 
 def validate_url(url):
     """Validate URL format"""
-    url_pattern = re.compile(r'^https?://[^\s/$.?#].[^\s]*$')
-    return url_pattern.match(url) is not None
+    return URL_PATTERN.match(url) is not None
 
 def validate_project_id(project_id):
     """Validate project ID format"""
@@ -72,11 +80,11 @@ def setup_tts_credentials():
         validator=validate_api_key
     )
     
-    print("\nDefault TTS URL: https://api.us-south.text-to-speech.watson.cloud.ibm.com")
+    print(f"\nDefault TTS URL: {DEFAULT_TTS_URL}")
     use_default_url = input("Use default TTS URL? (y/n): ").lower().startswith('y')
     
     if use_default_url:
-        tts_url = "https://api.us-south.text-to-speech.watson.cloud.ibm.com"
+        tts_url = DEFAULT_TTS_URL
     else:
         tts_url = get_user_input(
             "Enter your TTS URL: ",
@@ -103,11 +111,11 @@ def setup_watsonx_credentials():
         validator=validate_api_key
     )
     
-    print("\nDefault Watsonx URL: https://us-south.ml.cloud.ibm.com")
+    print(f"\nDefault Watsonx URL: {DEFAULT_WATSONX_URL}")
     use_default_url = input("Use default Watsonx URL? (y/n): ").lower().startswith('y')
     
     if use_default_url:
-        watsonx_url = "https://us-south.ml.cloud.ibm.com"
+        watsonx_url = DEFAULT_WATSONX_URL
     else:
         watsonx_url = get_user_input(
             "Enter your Watsonx URL: ",
@@ -123,16 +131,7 @@ def setup_watsonx_credentials():
 
 def update_env_file(credentials):
     """Update .env file with new credentials"""
-    env_path = '.env'
-    
-    # Read current .env file
-    env_lines = []
-    if os.path.exists(env_path):
-        with open(env_path, 'r') as f:
-            env_lines = f.readlines()
-    
     # Update or add credentials
-    updated_lines = []
     keys_to_update = {
         'TTS_API_KEY': credentials['tts_api_key'],
         'TTS_URL': credentials['tts_url'],
@@ -141,47 +140,77 @@ def update_env_file(credentials):
         'WATSONX_PROJECT_ID': credentials['watsonx_project_id']
     }
     
-    keys_found = set()
-    
-    for line in env_lines:
-        line = line.strip()
-        if '=' in line and not line.startswith('#'):
-            key = line.split('=')[0].strip()
-            if key in keys_to_update:
-                updated_lines.append(f"{key}={keys_to_update[key]}\n")
-                keys_found.add(key)
-            else:
-                updated_lines.append(line + '\n')
-        else:
-            updated_lines.append(line + '\n')
-    
-    # Add any missing keys
-    for key, value in keys_to_update.items():
-        if key not in keys_found:
-            updated_lines.append(f"{key}={value}\n")
-    
-    # Write updated .env file
-    with open(env_path, 'w') as f:
-        f.writelines(updated_lines)
-
-def test_credentials():
-    """Offer to test the credentials"""
+    update_env(keys_to_update)
+
+def test_credentials(test_now=None):
+    """Offer to test the credentials; test_now skips the prompt when given"""
     print_step(3, "Test Your Setup")
     
-    print("🧪 Would you like to test your IBM Watson credentials?")
-    test_now = input("Run credential test? (y/n): ").lower().startswith('y')
+    if test_now is None:
+        print("🧪 Would you like to test your IBM Watson credentials?")
+        test_now = input("Run credential test? (y/n): ").lower().startswith('y')
     
     if test_now:
         print("\n🔍 Running credential tests...")
-        os.system('python test_watson_credentials.py')
+        try:
+            import test_watson_credentials
+            test_watson_credentials.main()
+        except Exception as e:
+            print(f"\n❌ Test failed with error: {str(e)}")
     else:
         print("\n💡 You can test your credentials later by running:")
         print("   python test_watson_credentials.py")
 
+def parse_args():
+    """Parse command line flags for non-interactive setup"""
+    parser = argparse.ArgumentParser(description="Configure IBM Watson credentials for EchoVerse")
+    parser.add_argument('--tts-api-key', help="Text-to-Speech API key")
+    parser.add_argument('--tts-url', default=DEFAULT_TTS_URL, help="Text-to-Speech service URL")
+    parser.add_argument('--watsonx-api-key', help="Watsonx.ai API key")
+    parser.add_argument('--watsonx-url', default=DEFAULT_WATSONX_URL, help="Watsonx.ai service URL")
+    parser.add_argument('--watsonx-project-id', help="Watsonx.ai project ID")
+    parser.add_argument('--test', action=argparse.BooleanOptionalAction, default=None,
+                        help="Run (or skip) the credential test without asking")
+    args = parser.parse_args()
+    
+    required = [args.tts_api_key, args.watsonx_api_key, args.watsonx_project_id]
+    args.interactive = all(value is None for value in required)
+    if not args.interactive:
+        # Any credential flag switches to non-interactive mode, which needs all of them
+        checks = [
+            ('--tts-api-key', args.tts_api_key, validate_api_key),
+            ('--tts-url', args.tts_url, validate_url),
+            ('--watsonx-api-key', args.watsonx_api_key, validate_api_key),
+            ('--watsonx-url', args.watsonx_url, validate_url),
+            ('--watsonx-project-id', args.watsonx_project_id, validate_project_id)
+        ]
+        for flag, value, validator in checks:
+            if value is None:
+                parser.error(f"{flag} is required when running non-interactively")
+            if not validator(value):
+                parser.error(f"{flag}: invalid format")
+    return args
+
 def main():
     """Main setup function"""
+    args = parse_args()
     print_header()
     
+    if not args.interactive:
+        # Non-interactive run: everything comes from the command line
+        print("💾 Updating .env file...")
+        update_env_file({
+            'tts_api_key': args.tts_api_key,
+            'tts_url': args.tts_url,
+            'watsonx_api_key': args.watsonx_api_key,
+            'watsonx_url': args.watsonx_url,
+            'watsonx_project_id': args.watsonx_project_id
+        })
+        print("✅ Credentials saved to .env file")
+        print()
+        test_credentials(bool(args.test))
+        return
+    
     print("This script will help you configure IBM Watson credentials for EchoVerse.")
     print("Make sure you have:")
     print("✓ IBM Cloud account")
@@ -223,7 +252,7 @@ def main():
         print()
         
         # Test credentials
-        test_credentials()
+        test_credentials(args.test)
         
         print()
         print("🎉 Setup Complete!")
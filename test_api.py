@@ -1,64 +1,58 @@
-import unittest
-import json
+import pytest
 from app import app
 
-class TestEchoVerseAPI(unittest.TestCase):
-    
-    def setUp(self):
-        self.app = app.test_client()
-        self.app.testing = True
-
-    def test_health_check(self):
-        response = self.app.get('/health')
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
-        self.assertEqual(data['status'], 'healthy')
-
-    def test_get_voices(self):
-        response = self.app.get('/voices')
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
-        self.assertIn('voices', data)
-        self.assertTrue(len(data['voices']) > 0)
-
-    def test_get_tones(self):
-        response = self.app.get('/tones')
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
-        self.assertIn('tones', data)
-        self.assertTrue(len(data['tones']) > 0)
-
-    def test_rewrite_endpoint(self):
-        payload = {
-            'text': 'Hello world',
-            'tone': 'cheerful'
-        }
-        response = self.app.post('/rewrite',
-                                data=json.dumps(payload),
-                                content_type='application/json')
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
-        self.assertIn('rewritten_text', data)
-
-    def test_rewrite_invalid_tone(self):
-        payload = {
-            'text': 'Hello world',
-            'tone': 'invalid_tone'
-        }
-        response = self.app.post('/rewrite',
-                                data=json.dumps(payload),
-                                content_type='application/json')
-        self.assertEqual(response.status_code, 400)
-
-    def test_rewrite_empty_text(self):
-        payload = {
-            'text': '',
-            'tone': 'neutral'
-        }
-        response = self.app.post('/rewrite',
-                                data=json.dumps(payload),
-                                content_type='application/json')
-        self.assertEqual(response.status_code, 400)
+# The tests are independent of each other; run them in parallel with `pytest -n auto test_api.py`
+
+@pytest.fixture(scope='module')
+def client():
+    app.testing = True
+    return app.test_client()
+
+def test_health_check(client):
+    response = client.get('/health')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['status'] == 'healthy'
+
+def test_get_voices(client):
+    response = client.get('/voices')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert 'voices' in data
+    assert len(data['voices']) > 0
+
+def test_get_tones(client):
+    response = client.get('/tones')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert 'tones' in data
+    assert len(data['tones']) > 0
+
+def test_rewrite_endpoint(client):
+    payload = {
+        'text': 'Hello world',
+        'tone': 'cheerful'
+    }
+    response = client.post('/rewrite', json=payload)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert 'rewritten_text' in data
+
+def test_rewrite_invalid_tone(client):
+    payload = {
+        'text': 'Hello world',
+        'tone': 'invalid_tone'
+    }
+    response = client.post('/rewrite', json=payload)
+    assert response.status_code == 400
+
+def test_rewrite_empty_text(client):
+    payload = {
+        'text': '',
+        'tone': 'neutral'
+    }
+    response = client.post('/rewrite', json=payload)
+    assert response.status_code == 400
 
 if __name__ == '__main__':
-    unittest.main()
+    raise SystemExit(pytest.main([__file__]))
@@ -50,10 +50,13 @@ def test_database():
     print("2. Testing audio history...")
     history = db_manager.get_user_audio_history(user['id'], limit=5)
     print(f"✅ Found {len(history)} history items")
-    for i, item in enumerate(history, 1):
-        print(f"   {i}. {item['tone'].title()} tone - {item['voice'].title()} voice")
-        print(f"      📝 Text: {item['original_text'][:50]}...")
-        print(f"      🎵 Audio: {'Generated' if item['audio_generated'] else 'Not generated'}")
+    if history:
+        print("\n".join(
+            f"   {i}. {item['tone'].title()} tone - {item['voice'].title()} voice\n"
+            f"      📝 Text: {item['original_text'][:50]}...\n"
+            f"      🎵 Audio: {'Generated' if item['audio_generated'] else 'Not generated'}"
+            for i, item in enumerate(history, 1)
+        ))
     
     print()
     
@@ -62,35 +65,35 @@ def test_database():
     tones = db_manager.get_tones()
     voices = db_manager.get_voices()
     
-    print(f"✅ Available tones ({len(tones)}):")
-    for tone in tones[:5]:  # Show first 5
-        print(f"   - {tone['tone_name']}: {tone['description']}")
-    
-    print(f"✅ Available voices ({len(voices)}):")
-    for voice in voices:
-        print(f"   - {voice['voice_name']}: {voice['description']}")
+    # Build each listing and print it in one write
+    lines = [f"✅ Available tones ({len(tones)}):"]
+    lines.extend(f"   - {tone['tone_name']}: {tone['description']}" for tone in tones[:5])  # Show first 5
+    lines.append(f"✅ Available voices ({len(voices)}):")
+    lines.extend(f"   - {voice['voice_name']}: {voice['description']}" for voice in voices)
+    print("\n".join(lines))
     
     print()
     
-    # Test 4: Create a test history entry
+    # Test 4: Bulk-create test history entries
     print("4. Testing history creation...")
-    history_id = db_manager.create_audio_history(
-        user_id=user['id'],
-        original_text="This is a test message for database verification.",
-        rewritten_text="[NEUTRAL TONE] This is a test message for database verification.",
-        tone='neutral',
-        voice='allison',
-        audio_generated=False
-    )
+    rows = [
+        (user['id'], f"Test message {i} for database verification.",
+         f"[NEUTRAL TONE] Test message {i} for database verification.", 'neutral', 'allison', False)
+        for i in range(40)
+    ]
+    created = db_manager.bulk_create_audio_history(rows)
     
-    if history_id:
-        print(f"✅ Test history entry created with ID: {history_id}")
+    if created == len(rows):
+        print(f"✅ {created} test history entries created")
         
-        # Clean up - delete the test entry
-        db_manager.delete_audio_history(history_id, user['id'])
-        print("🧹 Test entry cleaned up")
+        # Clean up - delete the test entries in one statement
+        test_texts = {row[1] for row in rows}
+        history = db_manager.get_user_audio_history(user['id'], limit=len(rows))
+        test_ids = [item['id'] for item in history if item['original_text'] in test_texts]
+        deleted = db_manager.delete_audio_histories(user['id'], test_ids)
+        print(f"🧹 {deleted} test entries cleaned up")
     else:
-        print("❌ Failed to create test history entry")
+        print("❌ Failed to create test history entries")
         return False
     
     print()
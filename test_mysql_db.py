@@ -5,7 +5,8 @@ This script tests all database functionality with the MySQL backend.
 
 import os
 import sys
-from datetime import datetime
+import time
+from datetime import date
 from dotenv import load_dotenv
 
 # Add the backend directory to Python path
@@ -41,7 +42,9 @@ def test_mysql_database():
         print("\n3. Testing user operations...")
         
         # Create test user
-        test_email = f"test_{datetime.now().strftime('%Y%m%d_%H%M%S')}@example.com"
+        # Nanosecond timestamp keeps reruns within the same second from colliding
+        today = date.today()
+        test_email = f"test_{time.time_ns()}@example.com"
         user_id = db_manager.create_user(
             name="Test User",
             email=test_email,
@@ -68,66 +71,60 @@ def test_mysql_database():
         else:
             raise Exception("User update failed")
         
+        # Tests 4-8 write all their rows in one transaction, then each step checks its rows
+        with db_manager.seed_session() as cursor:
+            db_manager.add_user_skills_bulk(user_id, ["Test Skill"], cursor)
+            db_manager.add_user_interests_bulk(user_id, ["Test Interest"], cursor)
+            db_manager.add_user_achievements_bulk(user_id, [("Test Achievement", today)], cursor)
+            db_manager.add_user_projects_bulk(user_id, [{
+                "project_name": "Test Project",
+                "description": "This is a test project",
+                "technologies": "Python, MySQL",
+                "project_url": "https://github.com/test/project"
+            }], cursor)
+            history_id = db_manager.save_audio_history(
+                user_id=user_id,
+                original_text="This is test text for audio generation.",
+                rewritten_text="This represents test content for audio synthesis.",
+                tone="neutral",
+                voice="lisa",
+                cursor=cursor
+            )
+            
+            # Update status
+            db_manager.update_audio_history_status(history_id, "completed", "/audio/test_audio.wav", cursor=cursor)
+        
+        # Count every step's rows in one query
+        counts = db_manager.get_user_profile_counts(user_id)
+        
         # Test 4: User skills
         print("\n4. Testing user skills...")
-        skill_id = db_manager.add_user_skill(user_id, "Test Skill")
-        skills = db_manager.get_user_skills(user_id)
-        if skills and len(skills) > 0:
+        if counts.get('skills', 0) > 0:
             print("✅ Skills operations successful")
         
         # Test 5: User interests
         print("\n5. Testing user interests...")
-        interest_id = db_manager.add_user_interest(user_id, "Test Interest")
-        interests = db_manager.get_user_interests(user_id)
-        if interests and len(interests) > 0:
+        if counts.get('interests', 0) > 0:
             print("✅ Interests operations successful")
         
         # Test 6: User achievements
         print("\n6. Testing user achievements...")
-        achievement_id = db_manager.add_user_achievement(
-            user_id, 
-            "Test Achievement", 
-            datetime.now().date()
-        )
-        achievements = db_manager.get_user_achievements(user_id)
-        if achievements and len(achievements) > 0:
+        if counts.get('achievements', 0) > 0:
             print("✅ Achievements operations successful")
         
         # Test 7: User projects
         print("\n7. Testing user projects...")
-        project_id = db_manager.add_user_project(
-            user_id,
-            "Test Project",
-            "This is a test project",
-            "Python, MySQL",
-            "https://github.com/test/project"
-        )
-        projects = db_manager.get_user_projects(user_id)
-        if projects and len(projects) > 0:
+        if counts.get('projects', 0) > 0:
             print("✅ Projects operations successful")
         
         # Test 8: Audio history
         print("\n8. Testing audio history...")
-        history_id = db_manager.save_audio_history(
-            user_id=user_id,
-            original_text="This is test text for audio generation.",
-            rewritten_text="This represents test content for audio synthesis.",
-            tone="neutral",
-            voice="lisa"
-        )
-        
-        # Update status
-        db_manager.update_audio_history_status(history_id, "completed", "/audio/test_audio.wav")
-        
-        # Get history
-        history = db_manager.get_user_audio_history(user_id)
-        if history and len(history) > 0:
+        if counts.get('audio_history', 0) > 0:
             print("✅ Audio history operations successful")
         
         # Test 9: Configuration queries
         print("\n9. Testing configuration queries...")
-        tone_prompt = db_manager.get_tone_prompt("neutral")
-        voice_watson_id = db_manager.get_voice_watson_id("lisa")
+        tone_prompt, voice_watson_id = db_manager.get_config_lookup("neutral", "lisa")
         if tone_prompt and voice_watson_id:
             print("✅ Configuration queries successful")
         
@@ -1,25 +1,51 @@
+import shutil
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+
+# Add more sentences to synthesize several utterances concurrently
+sentences = [
+    'Welcome to EchoVerse! This is your AI-powered audiobook companion. I can now convert any text you provide into natural-sounding speech. Try me with your favorite story or article!'
+]
+
+# One keep-alive session shared by the request threads
+session = requests.Session()
+session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=16))
+
+def synth_one(text):
+    """POST one sentence to /synthesize and return the response"""
+    return session.post('http://localhost:5000/synthesize', json={'text': text}, stream=True)
+
+def output_path(index):
+    """File name for the audio of sentence index; the first keeps the original name"""
+    return 'endpoint_test_speech.wav' if index == 0 else f'endpoint_test_speech_{index}.wav'
 
 print('Testing /synthesize endpoint with real speech...')
 try:
-    response = requests.post('http://localhost:5000/synthesize', 
-                           json={'text': 'Welcome to EchoVerse! This is your AI-powered audiobook companion. I can now convert any text you provide into natural-sounding speech. Try me with your favorite story or article!'})
-    
-    print(f'Status: {response.status_code}')
-    print(f'Content-Type: {response.headers.get("content-type")}')
-    print(f'Audio Size: {len(response.content)} bytes')
-    
-    if response.status_code == 200:
-        with open('endpoint_test_speech.wav', 'wb') as f:
-            f.write(response.content)
-        print('✅ SUCCESS: Real speech from endpoint saved as endpoint_test_speech.wav')
-        
-        if len(response.content) > 100000:  # Large file indicates real speech
-            print('🎉 PERFECT: Large audio file generated - contains real speech!')
+    # Dispatch every sentence at once so server-side synthesis overlaps
+    with ThreadPoolExecutor(max_workers=min(16, len(sentences))) as executor:
+        responses = list(executor.map(synth_one, sentences))
+
+    for index, response in enumerate(responses):
+        path = output_path(index)
+        print(f'Status: {response.status_code}')
+        print(f'Content-Type: {response.headers.get("content-type")}')
+
+        if response.status_code == 200:
+            # Copy the body to disk in 64 KB chunks instead of materializing it
+            response.raw.decode_content = True
+            with open(path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, 64 * 1024)
+                size = f.tell()
+            print(f'Audio Size: {size} bytes')
+            print(f'✅ SUCCESS: Real speech from endpoint saved as {path}')
+
+            if size > 100000:  # Large file indicates real speech
+                print('🎉 PERFECT: Large audio file generated - contains real speech!')
+            else:
+                print('⚠️  Small audio file - might still be silence')
         else:
-            print('⚠️  Small audio file - might still be silence')
-    else:
-        print(f'❌ FAILED: {response.text}')
-        
+            print(f'❌ FAILED: {response.text}')
+
 except Exception as e:
     print(f'❌ ERROR: {e}')
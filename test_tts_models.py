@@ -1,4 +1,7 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 from dotenv import load_dotenv
 
@@ -8,21 +11,46 @@ token = os.getenv('HUGGINGFACE_API_TOKEN')
 # Test different TTS models that might work
 models_to_test = [
     'facebook/mms-tts-eng',
-    'microsoft/speecht5_tts', 
+    'microsoft/speecht5_tts',
     'suno/bark-small',
     'facebook/fastspeech2-en-ljspeech'
 ]
 
-headers = {'Authorization': f'Bearer {token}'}
+# Identical inputs on reruns are served from the inference gateway's result cache
+headers = {'Authorization': f'Bearer {token}', 'x-use-cache': 'true'}
 
-print('Testing available TTS models...')
-for model in models_to_test:
+# One keep-alive session shared by the probe threads so they reuse TLS connections
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    # Inference calls are idempotent, so retrying POST on gateway errors is safe
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                      allowed_methods=frozenset(['POST']), raise_on_status=False)
+))
+
+def probe(model):
+    """POST a short input to one model; returns (model, response) or (model, exception)"""
     try:
         url = f'https://api-inference.huggingface.co/models/{model}'
-        response = requests.post(url, 
-                               headers=headers,
-                               json={'inputs': 'Hello world'},
-                               timeout=15)
+        response = session.post(url,
+                                headers=headers,
+                                json={'inputs': 'Hello world', 'options': {'use_cache': True}},
+                                timeout=15)
+        return model, response
+    except Exception as e:
+        return model, e
+
+print('Testing available TTS models...')
+# Probe all models at once; wall time is the slowest model rather than the sum
+with ThreadPoolExecutor(max_workers=len(models_to_test)) as executor:
+    futures = [executor.submit(probe, model) for model in models_to_test]
+    for future in as_completed(futures):
+        model, response = future.result()
+        if isinstance(response, Exception):
+            print(f'{model}: ❌ Exception: {response}')
+            print()
+            continue
         print(f'{model}: Status {response.status_code}')
         if response.status_code == 200:
             content_type = response.headers.get('content-type', 'unknown')
@@ -36,6 +64,4 @@ for model in models_to_test:
         else:
             error_text = response.text[:100] if response.text else "No error message"
             print(f'  ❌ Error: {error_text}')
-    except Exception as e:
-        print(f'{model}: ❌ Exception: {e}')
-    print()
+        print()
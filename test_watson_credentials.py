@@ -6,37 +6,158 @@ Run this script to test your IBM Watson API credentials
 
 import os
 import sys
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import time
+import hashlib
+import functools
+from contextlib import contextmanager
+from dataclasses import dataclass
 from ibm_watson import TextToSpeechV1
 from ibm_cloud_sdk_core.authenticators import IAMAuthenticator
 from dotenv import load_dotenv
 
+# orjson parses response bodies several times faster than the stdlib json module
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# fcntl is POSIX-only; elsewhere the token cache just isn't locked across processes
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 # Load environment variables
 load_dotenv()
 
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Settings read from the environment once, at import"""
+    tts_api_key: str
+    tts_url: str
+    watsonx_api_key: str
+    watsonx_url: str
+    watsonx_project_id: str
+    cache_dir: str
+
+CFG = Config(
+    tts_api_key=os.getenv('TTS_API_KEY', ''),
+    tts_url=os.getenv('TTS_URL', ''),
+    watsonx_api_key=os.getenv('WATSONX_API_KEY', ''),
+    watsonx_url=os.getenv('WATSONX_URL', ''),
+    watsonx_project_id=os.getenv('WATSONX_PROJECT_ID', ''),
+    cache_dir=os.getenv('ECHOVERSE_CACHE_DIR', '~/.cache/echoverse')
+)
+
+# One keep-alive session so the IAM token fetch and the Watsonx call don't each pay a TLS handshake
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                      allowed_methods=frozenset(['POST']), raise_on_status=False)
+))
+
+# IAM tokens last about an hour; reruns within that window reuse the cached one
+TOKEN_CACHE_PATH = os.path.join(
+    os.path.expanduser(CFG.cache_dir), 'watson_iam.json'
+)
+
+# Seconds before expiry at which a cached token is treated as expired
+TOKEN_EXPIRY_MARGIN = 60
+
+@contextmanager
+def _token_cache_lock():
+    """Hold an exclusive lock on the token cache so concurrent runs fetch only one token"""
+    os.makedirs(os.path.dirname(TOKEN_CACHE_PATH), exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(TOKEN_CACHE_PATH + '.lock', 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _read_cached_token(key_hash):
+    """Return the cached token for this API key if it is still valid"""
+    try:
+        with open(TOKEN_CACHE_PATH, 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('key_hash') == key_hash and cached.get('expires_at', 0) > time.time():
+        return cached.get('token')
+    return None
+
+def _write_cached_token(key_hash, token, expires_in):
+    """Persist the token atomically, readable only by the current user"""
+    tmp_path = TOKEN_CACHE_PATH + '.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump({
+            'key_hash': key_hash,
+            'token': token,
+            'expires_at': time.time() + expires_in - TOKEN_EXPIRY_MARGIN
+        }, f)
+    os.replace(tmp_path, TOKEN_CACHE_PATH)
+
+# Credentials (Config fields) each service needs before any request is worth making
+TTS_FIELDS = ['tts_api_key', 'tts_url']
+WATSONX_FIELDS = ['watsonx_api_key', 'watsonx_url', 'watsonx_project_id']
+
+def _missing_config(fields):
+    """Return the .env names of fields that are unset or still hold a .env.example placeholder"""
+    return [field.upper() for field in fields
+            if not getattr(CFG, field) or getattr(CFG, field).endswith('_here')]
+
+_tts_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _build_tts(api_key, service_url):
+    """Build the TTS client once per credentials; its authenticator caches the IAM token"""
+    authenticator = IAMAuthenticator(api_key)
+    tts = TextToSpeechV1(authenticator=authenticator)
+    tts.set_service_url(service_url)
+    return tts
+
+def _get_tts():
+    """TTS client shared by the TTS tests, so they fetch one IAM token between them"""
+    # The tests run concurrently; the lock keeps them from building two clients
+    with _tts_lock:
+        return _build_tts(CFG.tts_api_key, CFG.tts_url)
+
 def test_tts_service():
     """Test IBM Watson Text-to-Speech service"""
     print("🎵 Testing Text-to-Speech Service...")
     
-    api_key = os.getenv('TTS_API_KEY')
-    service_url = os.getenv('TTS_URL')
+    api_key = CFG.tts_api_key
+    service_url = CFG.tts_url
     
-    if not api_key or not service_url:
+    if _missing_config(TTS_FIELDS):
         print("❌ TTS credentials not found in .env file")
         return False
     
     try:
-        # Initialize authenticator and service
-        authenticator = IAMAuthenticator(api_key)
-        tts = TextToSpeechV1(authenticator=authenticator)
-        tts.set_service_url(service_url)
+        # Shared authenticated service
+        tts = _get_tts()
         
         # Test with a simple phrase
         response = tts.synthesize(
             text='Hello from EchoVerse! Your Text-to-Speech service is working correctly.',
             voice='en-US_LisaV3Voice',
-            accept='audio/mp3'
+            accept='audio/mp3',
+            # Stream the body so the clip is written to disk chunk by chunk
+            stream=True
         )
         
         if response.status_code == 200:
@@ -46,7 +167,8 @@ def test_tts_service():
             
             # Save test audio file
             with open('test_tts_output.mp3', 'wb') as audio_file:
-                audio_file.write(response.get_result().content)
+                for chunk in response.get_result().iter_content(chunk_size=8192):
+                    audio_file.write(chunk)
             print("   Test audio saved as 'test_tts_output.mp3'")
             return True
         else:
@@ -59,26 +181,36 @@ def test_tts_service():
 
 def get_watson_access_token():
     """Get access token for Watsonx.ai"""
-    api_key = os.getenv('WATSONX_API_KEY')
+    api_key = CFG.watsonx_api_key
     
-    if not api_key:
+    if _missing_config(['watsonx_api_key']):
         return None
     
+    # Tokens are cached per API key; only a hash of the key is stored
+    key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+    
     try:
-        response = requests.post(
-            'https://iam.cloud.ibm.com/identity/token',
-            headers={'Content-Type': 'application/x-www-form-urlencoded'},
-            data={
-                'grant_type': 'urn:iam:params:oauth:grant-type:apikey',
-                'apikey': api_key
-            }
-        )
-        
-        if response.status_code == 200:
-            return response.json()['access_token']
-        else:
-            print(f"❌ Failed to get access token: {response.status_code}")
-            return None
+        with _token_cache_lock():
+            token = _read_cached_token(key_hash)
+            if token:
+                return token
+            
+            response = session.post(
+                'https://iam.cloud.ibm.com/identity/token',
+                headers={'Content-Type': 'application/x-www-form-urlencoded'},
+                data={
+                    'grant_type': 'urn:iam:params:oauth:grant-type:apikey',
+                    'apikey': api_key
+                }
+            )
+            
+            if response.status_code == 200:
+                result = _json_loads(response.content)
+                _write_cached_token(key_hash, result['access_token'], int(result.get('expires_in', 3600)))
+                return result['access_token']
+            else:
+                print(f"❌ Failed to get access token: {response.status_code}")
+                return None
             
     except Exception as e:
         print(f"❌ Access token error: {str(e)}")
@@ -88,11 +220,11 @@ def test_watsonx_service():
     """Test IBM Watsonx.ai service"""
     print("\n🤖 Testing Watsonx.ai Service...")
     
-    api_key = os.getenv('WATSONX_API_KEY')
-    base_url = os.getenv('WATSONX_URL')
-    project_id = os.getenv('WATSONX_PROJECT_ID')
+    api_key = CFG.watsonx_api_key
+    base_url = CFG.watsonx_url
+    project_id = CFG.watsonx_project_id
     
-    if not all([api_key, base_url, project_id]):
+    if _missing_config(WATSONX_FIELDS):
         print("❌ Watsonx credentials not found in .env file")
         return False
     
@@ -121,10 +253,10 @@ def test_watsonx_service():
             }
         }
         
-        response = requests.post(url, headers=headers, json=payload)
+        response = session.post(url, headers=headers, json=payload)
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json_loads(response.content)
             generated_text = result.get('results', [{}])[0].get('generated_text', '')
             
             print("✅ Watsonx Service: SUCCESS")
@@ -145,17 +277,12 @@ def test_available_voices():
     """Test and display available TTS voices"""
     print("\n🎤 Testing Available Voices...")
     
-    api_key = os.getenv('TTS_API_KEY')
-    service_url = os.getenv('TTS_URL')
-    
-    if not api_key or not service_url:
+    if _missing_config(TTS_FIELDS):
         print("❌ TTS credentials not available")
         return False
     
     try:
-        authenticator = IAMAuthenticator(api_key)
-        tts = TextToSpeechV1(authenticator=authenticator)
-        tts.set_service_url(service_url)
+        tts = _get_tts()
         
         voices = tts.list_voices().get_result()
         
@@ -170,6 +297,26 @@ def test_available_voices():
         print(f"❌ Error listing voices: {str(e)}")
         return False
 
+class _PerThreadStdout:
+    """sys.stdout stand-in that sends output from threads with a buffer to that buffer"""
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        return getattr(self._local, 'buffer', self.stream).write(text)
+    
+    def flush(self):
+        getattr(self._local, 'buffer', self.stream).flush()
+    
+    def run_buffered(self, func):
+        """Run func with this thread's output captured; returns (result, output)"""
+        self._local.buffer = io.StringIO()
+        try:
+            return func(), self._local.buffer.getvalue()
+        finally:
+            del self._local.buffer
+
 def main():
     """Main test function"""
     print("🧪 EchoVerse IBM Watson API Test Suite")
@@ -184,10 +331,26 @@ def main():
     
     print("📁 Environment file found")
     
-    # Test services
-    tts_success = test_tts_service()
-    watsonx_success = test_watsonx_service()
-    voices_success = test_available_voices()
+    # Nothing to test without credentials; don't spend any network round-trips
+    missing = _missing_config(TTS_FIELDS + WATSONX_FIELDS)
+    if _missing_config(['tts_api_key']) and _missing_config(['watsonx_api_key']):
+        print(f"❌ IBM Watson credentials not configured: {', '.join(missing)}")
+        print("💡 Run setup_watson_credentials.py or see IBM_WATSON_SETUP_GUIDE.md")
+        return
+    
+    # Test services concurrently; each test's output is buffered and printed in order afterwards
+    stdout = _PerThreadStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(stdout.run_buffered, test)
+                       for test in (test_tts_service, test_watsonx_service, test_available_voices)]
+            results = [future.result() for future in futures]
+    finally:
+        sys.stdout = stdout.stream
+    for _, output in results:
+        sys.stdout.write(output)
+    (tts_success, _), (watsonx_success, _), (voices_success, _) = results
     
     print("\n" + "=" * 50)
     print("📊 Test Results Summary:")